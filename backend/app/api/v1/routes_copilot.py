@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends
 
 from ...core.security import require_role, UserContext
@@ -8,12 +10,23 @@ from ...services.copilot_service import CopilotService
 router = APIRouter(tags=["copilot"])
 
 
-service = CopilotService()
+@lru_cache(maxsize=1)
+def get_copilot_service() -> CopilotService:
+    return CopilotService()
+
+
+async def close_copilot_service() -> None:
+    # Only close a service that was actually built, and forget it so a
+    # restarted app gets a fresh client instead of a closed one.
+    if get_copilot_service.cache_info().currsize:
+        await get_copilot_service().aclose()
+        get_copilot_service.cache_clear()
 
 
 @router.post("/copilot/query", response_model=CopilotQueryResponse)
 async def copilot_query(
     payload: CopilotQueryRequest,
     user: UserContext = Depends(require_role(["planner", "admin", "viewer"])),
+    service: CopilotService = Depends(get_copilot_service),
 ) -> CopilotQueryResponse:
-    return service.answer_query(payload)
+    return await service.answer_query(payload)
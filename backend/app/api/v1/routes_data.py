@@ -1,24 +1,27 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Form
 from fastapi import HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
+import io
+import os
+import shutil
+import orjson
 import pandas as pd
-import numpy as np
+from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype, is_numeric_dtype
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 from ...core.security import require_role, UserContext
+from ...feature_store.registry import DATASET_TYPES, UPLOAD_DIR, resolve_dataset
 
 
 router = APIRouter(tags=["data"])
 
 
-# Use the same base data directory as the feature store so that uploaded
-# datasets (e.g. sales.csv) are visible to forecasting. For this file,
-# parents[4] points to the repository root (c:\IBP_ai), so data lives in
-# c:\IBP_ai\data and uploads in c:\IBP_ai\data\uploads.
-DATA_DIR = Path(__file__).resolve().parents[4] / "data"
-UPLOAD_DIR = DATA_DIR / "uploads"
-
-
 def _required_columns(dataset_type: str) -> set[str]:
     mapping: dict[str, set[str]] = {
         # For sales we do not require any specific column names; we rely on
@@ -33,42 +36,48 @@ def _required_columns(dataset_type: str) -> set[str]:
     return mapping.get(dataset_type, set())
 
 
+_SALES_ALIASES: dict[str, frozenset[str]] = {
+    "date": frozenset({"date", "orderdate", "order_date", "transactiondate", "saledate"}),
+    "quantity": frozenset({"quantity", "qty", "units", "unitssold", "salesqty", "salesunits"}),
+}
+
+
+@lru_cache(maxsize=4096)
+def _norm(name: str) -> str:
+    return name.lower().replace(" ", "").replace("_", "")
+
+
+def _column_role(lower_name: str, dtype) -> str:
+    if is_datetime64_any_dtype(dtype) or "date" in lower_name:
+        return "date"
+    if is_numeric_dtype(dtype) and not is_bool_dtype(dtype):
+        return "numeric"
+    return "categorical"
+
+
 def _analyze_dataframe(df: pd.DataFrame, dataset_type: str) -> tuple[list[dict], list[str]]:
-    schema: list[dict] = []
-    for col in df.columns:
-        series = df[col]
-        dtype_str = str(series.dtype)
-        role = "categorical"
-        if np.issubdtype(series.dtype, np.number):
-            role = "numeric"
-        if np.issubdtype(series.dtype, "datetime64[ns]") or "date" in col.lower():
-            role = "date"
-        schema.append({"name": col, "dtype": dtype_str, "role": role})
+    # Read the dtypes once instead of materialising a Series per column.
+    schema: list[dict] = [
+        {"name": col, "dtype": str(dtype), "role": _column_role(str(col).lower(), dtype)}
+        for col, dtype in zip(df.columns, df.dtypes)
+    ]
 
     warnings: list[str] = []
     required = _required_columns(dataset_type)
 
-    def _norm(name: str) -> str:
-        return name.lower().replace(" ", "").replace("_", "")
-
     col_norms = {_norm(col): col for col in df.columns}
 
     missing: list[str] = []
     if dataset_type == "sales" and required:
         # For sales we are lenient and accept common aliases for date/quantity
-        alias_map: dict[str, set[str]] = {
-            "date": {"date", "orderdate", "order_date", "transactiondate", "saledate"},
-            "quantity": {"quantity", "qty", "units", "unitssold", "salesqty", "salesunits"},
-        }
-
+        col_norm_set = set(col_norms)
         for base in required:
-            aliases = alias_map.get(base, {base})
-            base_missing = True
-            for col_key in col_norms.keys():
-                if any(alias == col_key or alias in col_key for alias in aliases):
-                    base_missing = False
-                    break
-            if base_missing:
+            aliases = _SALES_ALIASES.get(base, frozenset({base}))
+            # Exact matches are a single set intersection; only fall back to
+            # substring scans when none of the aliases matched outright.
+            if aliases & col_norm_set:
+                continue
+            if not any(alias in col_key for col_key in col_norm_set for alias in aliases):
                 missing.append(base)
     else:
         for req in required:
@@ -83,20 +92,96 @@ def _analyze_dataframe(df: pd.DataFrame, dataset_type: str) -> tuple[list[dict],
     return schema, warnings
 
 
+def _read_head(path: Path, limit: int) -> pd.DataFrame:
+    # Stream record batches with the multithreaded pyarrow parser and stop as
+    # soon as the preview is filled, instead of parsing the whole file.
+    reader = pacsv.open_csv(path)
+    batches: list[pa.RecordBatch] = []
+    seen = 0
+    for batch in reader:
+        batches.append(batch)
+        seen += batch.num_rows
+        if seen >= limit:
+            break
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+    return table.slice(0, max(limit, 0)).to_pandas()
+
+
+# Block size for the row-counting pass. Larger blocks mean fewer batches
+# (and less per-batch overhead) on multi-GB uploads; memory stays bounded by
+# one block per parser thread.
+_COUNT_BLOCK_SIZE = 16 << 20
+
+
+def _count_rows(path: Path, first_column: str) -> int:
+    # Only materialise a single column (as plain strings, so no type
+    # inference can fail mid-file) to count data rows.
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=_COUNT_BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=[first_column],
+            column_types={first_column: pa.string()},
+        ),
+    )
+    return sum(batch.num_rows for batch in reader)
+
+
+def _read_parquet_head(path: Path, limit: int) -> tuple[pd.DataFrame, int]:
+    # Parquet footers carry the row count, so only the first batch is decoded.
+    parquet_file = pq.ParquetFile(path)
+    batch = next(parquet_file.iter_batches(batch_size=max(limit, 1)), None)
+    if batch is None:
+        table = parquet_file.schema_arrow.empty_table()
+    else:
+        table = pa.Table.from_batches([batch])
+    head = table.slice(0, max(limit, 0)).to_pandas()
+    return head, parquet_file.metadata.num_rows
+
+
+def _drop_other_formats(dataset_type: str, keep: Path) -> None:
+    for suffix in (".parquet", ".csv"):
+        path = UPLOAD_DIR / f"{dataset_type}{suffix}"
+        if path != keep:
+            path.unlink(missing_ok=True)
+
+
+def _json_default(value):
+    # NaT and pandas Timestamps are not handled natively by orjson.
+    if value is pd.NaT:
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError
+
+
+class _DatasetResponse(JSONResponse):
+    # Preview rows are plain records full of numpy scalars, dates and NaNs;
+    # orjson encodes those directly (NaN as null) and several times faster
+    # than the stdlib encoder.
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY, default=_json_default)
+
+
 def _build_dataset_response(
     dataset_type: str,
-    df: pd.DataFrame,
     path: Path,
     *,
     limit: int = 20,
 ) -> JSONResponse:
-    head = df.head(limit)
-    schema, warnings = _analyze_dataframe(df, dataset_type)
-    return JSONResponse(
+    if path.suffix == ".parquet":
+        head, rows = _read_parquet_head(path, limit)
+        columns = list(head.columns)
+    else:
+        head = _read_head(path, limit)
+        columns = list(head.columns)
+        rows = _count_rows(path, columns[0]) if columns else 0
+    schema, warnings = _analyze_dataframe(head, dataset_type)
+    return _DatasetResponse(
         {
             "dataset_type": dataset_type,
-            "rows": int(len(df)),
-            "columns": list(df.columns),
+            "rows": rows,
+            "columns": columns,
             "preview": head.to_dict(orient="records"),
             "path": str(path),
             "schema": schema,
@@ -105,21 +190,73 @@ def _build_dataset_response(
     )
 
 
+def _save_upload(file: UploadFile, path: Path) -> None:
+    # Stream the spooled upload straight to disk in 1 MiB chunks instead of
+    # buffering the whole body in memory first.
+    src = file.file
+    src.seek(0)
+    with path.open("wb") as out:
+        # Where the upload is backed by a real file, the kernel can copy it
+        # file-to-file without bouncing through Python. (A spooled upload
+        # still in memory is at most the 1 MiB spool size; fileno() writes it
+        # out first.) Anything without a usable descriptor is copied in chunks.
+        if hasattr(os, "sendfile"):
+            try:
+                _sendfile_all(src.fileno(), out.fileno())
+                return
+            except (io.UnsupportedOperation, OSError):
+                src.seek(0)
+                out.seek(0)
+                out.truncate()
+        shutil.copyfileobj(src, out, length=1 << 20)
+
+
+def _sendfile_all(src_fd: int, dst_fd: int) -> None:
+    offset = 0
+    while True:
+        sent = os.sendfile(dst_fd, src_fd, offset, 1 << 30)
+        if sent == 0:
+            return
+        offset += sent
+
+
+def _persist_frame(df: pd.DataFrame, dataset_type: str) -> Path:
+    # Persist the parsed frame as parquet: it keeps the dtypes and reads
+    # back far faster than a re-serialised CSV.
+    target_path = UPLOAD_DIR / f"{dataset_type}.parquet"
+    try:
+        df.to_parquet(target_path, index=False)
+    except (pa.ArrowException, ValueError):
+        # Mixed-type object columns cannot be stored as parquet.
+        target_path.unlink(missing_ok=True)
+        target_path = UPLOAD_DIR / f"{dataset_type}.csv"
+        df.to_csv(target_path, index=False)
+    _drop_other_formats(dataset_type, target_path)
+    return target_path
+
+
+@lru_cache(maxsize=32)
+def _cached_preview(
+    path_str: str,
+    mtime_ns: int,
+    size: int,
+    limit: int,
+    dataset_type: str,
+) -> bytes:
+    # Keyed on the file's mtime/size so a fresh upload invalidates the entry;
+    # only the encoded body is kept, never the DataFrame.
+    return _build_dataset_response(dataset_type, Path(path_str), limit=limit).body
+
+
+# Parsing and file IO below is synchronous; it runs in the threadpool so a
+# large upload does not stall every other request on the event loop.
 @router.post("/data/upload")
 async def upload_dataset(
     dataset_type: str = Form(..., description="sales|inventory|production|purchase_orders|master_data|external_signals"),
     file: UploadFile = File(...),
     user: UserContext = Depends(require_role(["planner", "admin"])),
 ) -> JSONResponse:
-    allowed = {
-        "sales",
-        "inventory",
-        "production",
-        "purchase_orders",
-        "master_data",
-        "external_signals",
-    }
-    if dataset_type not in allowed:
+    if dataset_type not in DATASET_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid dataset_type",
@@ -135,32 +272,30 @@ async def upload_dataset(
             detail="Unsupported file type. Please upload a CSV or Excel file.",
         )
 
-    content = await file.read()
-
     if ext in {".xlsx", ".xls"}:
         temp_path = UPLOAD_DIR / f"{dataset_type}{ext}"
-        temp_path.write_bytes(content)
+        await run_in_threadpool(_save_upload, file, temp_path)
         try:
-            df = pd.read_excel(temp_path)
+            # calamine parses xlsx/xls natively in Rust, far faster than openpyxl.
+            df = await run_in_threadpool(pd.read_excel, temp_path, engine="calamine")
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to parse Excel file: {exc}",
             ) from exc
-        target_path = UPLOAD_DIR / f"{dataset_type}.csv"
-        df.to_csv(target_path, index=False)
-    else:
-        target_path = UPLOAD_DIR / f"{dataset_type}.csv"
-        target_path.write_bytes(content)
-        try:
-            df = pd.read_csv(target_path)
-        except Exception as exc:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to parse CSV: {exc}",
-            ) from exc
+        target_path = await run_in_threadpool(_persist_frame, df, dataset_type)
+        return await run_in_threadpool(_build_dataset_response, dataset_type, target_path)
 
-    return _build_dataset_response(dataset_type, df, target_path)
+    target_path = UPLOAD_DIR / f"{dataset_type}.csv"
+    await run_in_threadpool(_save_upload, file, target_path)
+    _drop_other_formats(dataset_type, target_path)
+    try:
+        return await run_in_threadpool(_build_dataset_response, dataset_type, target_path)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to parse CSV: {exc}",
+        ) from exc
 
 
 @router.get("/data/preview")
@@ -168,21 +303,8 @@ async def preview_dataset(
     dataset_type: str,
     limit: int = 20,
     user: UserContext = Depends(require_role(["planner", "admin", "viewer"])),
-) -> JSONResponse:
-    sample_map = {
-        "sales": DATA_DIR / "sample_sales.csv",
-        "inventory": DATA_DIR / "sample_inventory.csv",
-        "production": DATA_DIR / "sample_production.csv",
-        "purchase_orders": DATA_DIR / "sample_purchase_orders.csv",
-        "master_data": DATA_DIR / "sample_master_data.csv",
-        "external_signals": DATA_DIR / "sample_external_signals.csv",
-    }
-
-    upload_path = UPLOAD_DIR / f"{dataset_type}.csv"
-    if upload_path.exists():
-        path = upload_path
-    else:
-        path = sample_map.get(dataset_type)
+) -> Response:
+    path = resolve_dataset(dataset_type) if dataset_type in DATASET_TYPES else None
 
     if path is None or not path.exists():
         raise HTTPException(
@@ -190,6 +312,8 @@ async def preview_dataset(
             detail="Dataset not found",
         )
 
-    df = pd.read_csv(path)
-
-    return _build_dataset_response(dataset_type, df, path, limit=limit)
+    stat = path.stat()
+    body = await run_in_threadpool(
+        _cached_preview, str(path), stat.st_mtime_ns, stat.st_size, limit, dataset_type
+    )
+    return Response(content=body, media_type="application/json")
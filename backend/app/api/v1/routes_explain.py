@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends
 
 from ...core.security import require_role, UserContext
@@ -8,12 +10,15 @@ from ...services.explainability_service import ExplainabilityService
 router = APIRouter(tags=["explain"])
 
 
-explain_service = ExplainabilityService()
+@lru_cache(maxsize=1)
+def get_explain_service() -> ExplainabilityService:
+    return ExplainabilityService()
 
 
 @router.get("/explain/{forecast_id}", response_model=ExplainResponse)
 async def explain_forecast(
     forecast_id: str,
     user: UserContext = Depends(require_role(["planner", "admin", "viewer"])),
+    explain_service: ExplainabilityService = Depends(get_explain_service),
 ) -> ExplainResponse:
     return explain_service.explain_forecast(forecast_id)
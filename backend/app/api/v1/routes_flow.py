@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends
+
+from ...core.security import require_role, UserContext
+from ...models.flow import FlowRequest, FlowResponse
+from ...services.flow_service import FlowService
+from .routes_explain import get_explain_service
+from .routes_forecast import get_forecast_service
+from .routes_plan import get_planning_service
+from .routes_scenario import get_scenario_service
+
+
+router = APIRouter(tags=["flow"])
+
+
+@lru_cache(maxsize=1)
+def get_flow_service() -> FlowService:
+    return FlowService(
+        get_forecast_service(),
+        get_planning_service(),
+        get_explain_service(),
+        get_scenario_service(),
+    )
+
+
+@router.post("/flow", response_model=FlowResponse)
+async def run_flow(
+    payload: FlowRequest,
+    user: UserContext = Depends(require_role(["planner", "admin"])),
+    flow_service: FlowService = Depends(get_flow_service),
+) -> FlowResponse:
+    return flow_service.run_flow(payload)
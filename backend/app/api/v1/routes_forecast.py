@@ -1,19 +1,39 @@
-from fastapi import APIRouter, Depends
+from functools import lru_cache
+
+from fastapi import APIRouter, BackgroundTasks, Depends, status
 
 from ...core.security import require_role, UserContext
-from ...models.forecast import ForecastRequest, ForecastResponse
+from ...models.forecast import ForecastRequest, ForecastResponse, ForecastWarmRequest
 from ...services.forecasting_service import ForecastService
 
 
 router = APIRouter(tags=["forecast"])
 
 
-forecast_service = ForecastService()
+# Built on first use and shared afterwards; tests can swap it out through
+# app.dependency_overrides.
+@lru_cache(maxsize=1)
+def get_forecast_service() -> ForecastService:
+    return ForecastService()
 
 
 @router.post("/forecast", response_model=ForecastResponse)
 async def create_forecast(
     payload: ForecastRequest,
     user: UserContext = Depends(require_role(["planner", "admin"])),
+    forecast_service: ForecastService = Depends(get_forecast_service),
 ) -> ForecastResponse:
     return forecast_service.generate_forecast(payload)
+
+
+@router.post("/forecast/warm", status_code=status.HTTP_202_ACCEPTED)
+async def warm_forecast_cache(
+    payload: ForecastWarmRequest,
+    background_tasks: BackgroundTasks,
+    user: UserContext = Depends(require_role(["planner", "admin"])),
+    forecast_service: ForecastService = Depends(get_forecast_service),
+) -> dict:
+    # Fitting can take seconds per SKU, so acknowledge straight away and let
+    # the fits populate the model cache after the response is sent.
+    background_tasks.add_task(forecast_service.warm_cache, payload)
+    return {"status": "scheduled", "sku_list": payload.sku_list}
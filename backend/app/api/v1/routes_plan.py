@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends
 
 from ...core.security import require_role, UserContext
@@ -8,12 +10,15 @@ from ...services.planning_service import PlanningService
 router = APIRouter(tags=["plan"])
 
 
-planning_service = PlanningService()
+@lru_cache(maxsize=1)
+def get_planning_service() -> PlanningService:
+    return PlanningService()
 
 
 @router.post("/plan/generate", response_model=PlanResponse)
 async def generate_plan(
     payload: PlanGenerateRequest,
     user: UserContext = Depends(require_role(["planner", "admin"])),
+    planning_service: PlanningService = Depends(get_planning_service),
 ) -> PlanResponse:
     return planning_service.generate_plan(payload)
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends
 
 from ...core.security import require_role, UserContext
@@ -12,13 +14,16 @@ from ...services.scenario_service import ScenarioService
 router = APIRouter(tags=["scenario"])
 
 
-scenario_service = ScenarioService()
+@lru_cache(maxsize=1)
+def get_scenario_service() -> ScenarioService:
+    return ScenarioService()
 
 
 @router.post("/scenario", response_model=ScenarioResponse)
 async def run_scenario(
     payload: ScenarioRequest,
     user: UserContext = Depends(require_role(["planner", "admin"])),
+    scenario_service: ScenarioService = Depends(get_scenario_service),
 ) -> ScenarioResponse:
     return scenario_service.run_scenario(payload)
 
@@ -28,6 +33,7 @@ async def list_scenarios(
     forecast_id: str | None = None,
     plan_id: str | None = None,
     user: UserContext = Depends(require_role(["planner", "admin", "viewer"])),
+    scenario_service: ScenarioService = Depends(get_scenario_service),
 ) -> ScenarioListResponse:
     return scenario_service.list_scenarios(forecast_id=forecast_id, plan_id=plan_id)
 
@@ -36,5 +42,6 @@ async def list_scenarios(
 async def get_scenario(
     scenario_id: str,
     user: UserContext = Depends(require_role(["planner", "admin", "viewer"])),
+    scenario_service: ScenarioService = Depends(get_scenario_service),
 ) -> ScenarioResponse:
     return scenario_service.get_scenario(scenario_id)
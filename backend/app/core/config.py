@@ -19,6 +19,28 @@ class Settings(BaseSettings):
     # Storage (placeholders – wire to Postgres/S3 in real deployments)
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./ibp_ai.db")
 
+    # Forecasting: worker processes used to fit SKUs in parallel (<= 0 means
+    # one per CPU core).
+    forecast_n_jobs: int = int(os.getenv("IBP_FORECAST_N_JOBS", "-1"))
+    # Directory for persisted fitted models (empty disables the disk cache).
+    # Entries are pickles, so it must be private to the API's user: it is
+    # created 0700 and ignored if another user owns it.
+    forecast_cache_dir: str = os.getenv(
+        "IBP_FORECAST_CACHE_DIR",
+        os.path.join(os.getenv("XDG_CACHE_HOME", "~/.cache"), "ibp_ai", "forecast_models"),
+    )
+    # Size cap for that directory; least recently used models are pruned
+    # first. Accepts joblib's K/M/G suffixes.
+    forecast_cache_max_bytes: str = os.getenv("IBP_FORECAST_CACHE_MAX_BYTES", "1G")
+
+    # Directory for merged sales+signals parquet snapshots (empty disables
+    # them). Kept out of data/uploads so it only ever holds disposable cache.
+    feature_snapshot_dir: str = os.getenv("IBP_FEATURE_SNAPSHOT_DIR", "/tmp/ibp_feature_snapshots")
+
+    # Journal file that forecasts, plans and scenarios are appended to and
+    # replayed from on startup (empty keeps the store purely in memory).
+    store_journal_path: str = os.getenv("IBP_STORE_JOURNAL", "")
+
     # MLOps / tracking
     mlflow_tracking_uri: str | None = os.getenv("MLFLOW_TRACKING_URI")
 
@@ -1,9 +1,19 @@
+import hmac
+
 from fastapi import Header, HTTPException, status, Depends
 from typing import Optional
 
 from .config import get_settings
 
 
+# Settings are cached for the process lifetime, so bind the values checked on
+# every request once at import instead of re-reading them per call.
+_settings = get_settings()
+_API_KEY_BYTES = _settings.api_key.encode()
+_DEFAULT_ROLE = _settings.default_role
+_ALLOWED_ROLES = frozenset(_settings.allowed_roles)
+
+
 class UserContext:
     def __init__(self, api_key: str, role: str):
         self.api_key = api_key
@@ -14,16 +24,15 @@ async def get_current_user(
     x_api_key: Optional[str] = Header(default=None, alias="X-API-Key"),
     x_role: Optional[str] = Header(default=None, alias="X-Role"),
 ) -> UserContext:
-    settings = get_settings()
-
-    if x_api_key is None or x_api_key != settings.api_key:
+    # Constant-time comparison so response timing does not leak the key.
+    if x_api_key is None or not hmac.compare_digest(x_api_key.encode(), _API_KEY_BYTES):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing API key",
         )
 
-    role = x_role or settings.default_role
-    if role not in settings.allowed_roles:
+    role = x_role or _DEFAULT_ROLE
+    if role not in _ALLOWED_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Role not allowed",
@@ -33,8 +42,10 @@ async def get_current_user(
 
 
 def require_role(required_roles: list[str]):
+    allowed = frozenset(required_roles)
+
     async def _dependency(user: UserContext = Depends(get_current_user)) -> UserContext:
-        if user.role not in required_roles:
+        if user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions",
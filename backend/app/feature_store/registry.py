@@ -1,56 +1,163 @@
+import hashlib
+import logging
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+from pandas.api.types import is_datetime64_any_dtype
+
+from ..core.config import get_settings
 
 
 BASE_DIR = Path(__file__).resolve().parents[3]
 DATA_DIR = BASE_DIR / "data"
 UPLOAD_DIR = DATA_DIR / "uploads"
 
+DATASET_TYPES = (
+    "sales",
+    "inventory",
+    "production",
+    "purchase_orders",
+    "master_data",
+    "external_signals",
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever _merge_sales_with_signals changes its output, so snapshots
+# (and the model caches keyed on sales_with_signals_version) are rebuilt.
+_MERGE_VERSION = "2"
+
 
+# Column names repeat across uploads and forecast calls, so memoise the
+# normalisation; the bound keeps arbitrary user headers from growing it forever.
+@lru_cache(maxsize=4096)
 def _normalize(name: str) -> str:
     return name.strip().lower().replace(" ", "").replace("_", "")
 
 
-def _guess_column(columns: list[str], candidates: list[str]) -> str | None:
-    norm_to_original = {_normalize(c): c for c in columns}
-    for cand in candidates:
-        key = _normalize(cand)
-        for norm, original in norm_to_original.items():
-            if norm == key:
-                return original
+def _candidates(*names: str) -> tuple[str, ...]:
+    return tuple(dict.fromkeys(_normalize(n) for n in names))
+
+
+_DATE_CANDIDATES = _candidates("date", "order_date", "orderdate")
+_SKU_CANDIDATES = _candidates("sku", "product", "item", "product_id", "productid")
+_LOCATION_CANDIDATES = _candidates("location", "region", "store", "warehouse", "country")
+_QTY_CANDIDATES = _candidates("quantity", "qty", "units", "orderquantity", "order_qty")
+
+
+def _guess_column(norm_to_original: dict[str, str], candidates: tuple[str, ...]) -> str | None:
+    # Both the column map and the candidates are already normalised, so exact
+    # matches are plain dict lookups.
+    for key in candidates:
+        if key in norm_to_original:
+            return norm_to_original[key]
     # fallback: try substring matching
-    for cand in candidates:
-        key = _normalize(cand)
+    for key in candidates:
         for norm, original in norm_to_original.items():
             if key in norm:
                 return original
     return None
 
 
+def resolve_dataset(name: str) -> Path:
+    """Return the file dataset ``name`` is read from.
+
+    Excel uploads are persisted as parquet and CSV uploads as-is, so those are
+    tried first; otherwise the bundled sample, which may not exist.
+    """
+    for path in (UPLOAD_DIR / f"{name}.parquet", UPLOAD_DIR / f"{name}.csv"):
+        if path.exists():
+            return path
+    return DATA_DIR / f"sample_{name}.csv"
+
+
+def _read_dataset(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _fingerprint(sales_path: Path, signals_path: Path) -> str:
+    # Key on both inputs' location, mtime and size so any new upload (or a
+    # switch back to the samples) produces a different value.
+    fingerprint = "|".join(
+        [_MERGE_VERSION]
+        + [f"{p}:{p.stat().st_mtime_ns}:{p.stat().st_size}" for p in (sales_path, signals_path)]
+    )
+    return hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+
+
+def _snapshot_path(sales_path: Path, signals_path: Path) -> Path | None:
+    snapshot_dir = get_settings().feature_snapshot_dir
+    if not snapshot_dir:
+        return None
+    return Path(snapshot_dir) / f"merged_{_fingerprint(sales_path, signals_path)}.parquet"
+
+
+def _write_snapshot(merged: pd.DataFrame, snapshot: Path) -> None:
+    # Write to a private temp file and rename it into place, so concurrent
+    # readers only ever see a complete file. Old snapshots are left alone:
+    # another process may still be reading one, and the directory is a cache
+    # that can be cleared at any time.
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=snapshot.parent, prefix=".merged_", suffix=".tmp")
+    os.close(fd)
+    try:
+        merged.to_parquet(tmp_name, index=False)
+        os.replace(tmp_name, snapshot)
+    except (pa.ArrowException, ValueError, OSError):
+        # Mixed-type object columns cannot be stored as parquet; just skip
+        # the snapshot and rebuild on the next call.
+        Path(tmp_name).unlink(missing_ok=True)
+
+
+def sales_with_signals_version() -> str:
+    """Return a token that changes whenever load_sales_with_signals() would."""
+    return _fingerprint(resolve_dataset("sales"), resolve_dataset("external_signals"))
+
+
 def load_sales_with_signals() -> pd.DataFrame:
-    sales_path = UPLOAD_DIR / "sales.csv"
-    if not sales_path.exists():
-        sales_path = DATA_DIR / "sample_sales.csv"
+    sales_path = resolve_dataset("sales")
+    signals_path = resolve_dataset("external_signals")
+
+    snapshot = _snapshot_path(sales_path, signals_path)
+    if snapshot is not None and snapshot.exists():
+        try:
+            return pd.read_parquet(snapshot)
+        except (pa.ArrowException, OSError, ValueError):
+            logger.warning("Unreadable feature snapshot %s; rebuilding", snapshot)
+
+    merged = _merge_sales_with_signals(sales_path, signals_path)
+    if snapshot is not None:
+        _write_snapshot(merged, snapshot)
+    return merged
 
-    signals_path = UPLOAD_DIR / "external_signals.csv"
-    if not signals_path.exists():
-        signals_path = DATA_DIR / "sample_external_signals.csv"
 
-    sales = pd.read_csv(sales_path)
+def _merge_sales_with_signals(sales_path: Path, signals_path: Path) -> pd.DataFrame:
+    sales = _read_dataset(sales_path)
 
     # Heuristic mapping so slightly different schemas (e.g. Product/Region/Date/Quantity)
     # can still be used for forecasting.
-    cols = list(sales.columns)
-    date_col = _guess_column(cols, ["date", "order_date", "orderdate"])
-    sku_col = _guess_column(cols, ["sku", "product", "item", "product_id", "productid"])
-    location_col = _guess_column(cols, ["location", "region", "store", "warehouse", "country"])
-    qty_col = _guess_column(cols, ["quantity", "qty", "units", "orderquantity", "order_qty"])
+    norm_to_original = {_normalize(c): c for c in sales.columns}
+    date_col = _guess_column(norm_to_original, _DATE_CANDIDATES)
+    sku_col = _guess_column(norm_to_original, _SKU_CANDIDATES)
+    location_col = _guess_column(norm_to_original, _LOCATION_CANDIDATES)
+    qty_col = _guess_column(norm_to_original, _QTY_CANDIDATES)
 
     if date_col is None or qty_col is None:
         raise ValueError("Sales dataset is missing a usable date or quantity column.")
 
-    sales[date_col] = pd.to_datetime(sales[date_col])
+    # Parquet snapshots/uploads already carry datetime64 dates; only parse strings.
+    if not is_datetime64_any_dtype(sales[date_col].dtype):
+        try:
+            sales[date_col] = pd.to_datetime(sales[date_col], format="ISO8601", cache=True)
+        except (ValueError, TypeError):
+            # Not ISO formatted (e.g. 01/31/2025); let pandas infer the format.
+            sales[date_col] = pd.to_datetime(sales[date_col], cache=True)
     sales = sales.rename(columns={date_col: "date"})
 
     rename_map: dict[str, str] = {}
@@ -70,7 +177,8 @@ def load_sales_with_signals() -> pd.DataFrame:
     if "location" not in sales.columns:
         sales["location"] = "ALL-LOC"
 
-    signals = pd.read_csv(signals_path, parse_dates=["date"])
+    signals = _read_dataset(signals_path)
+    signals["date"] = pd.to_datetime(signals["date"])
 
     # Use LEFT merge to keep all sales rows, filling missing signal values with NaN
     merged = sales.merge(
@@ -80,12 +188,14 @@ def load_sales_with_signals() -> pd.DataFrame:
     )
     
     # Fill NaN values in signal columns with reasonable defaults
-    signal_cols = ["is_holiday", "temperature", "google_trends_index", "promotion", "price"]
-    for col in signal_cols:
-        if col in merged.columns:
-            if col == "is_holiday":
-                merged[col] = merged[col].fillna(0)
-            elif col in ["temperature", "google_trends_index", "promotion", "price"]:
-                merged[col] = merged[col].fillna(merged[col].mean())
+    # (one column-wise mean and a single fillna instead of a write per column).
+    numeric_cols = [
+        c for c in ("temperature", "google_trends_index", "promotion", "price") if c in merged.columns
+    ]
+    fill_values = merged[numeric_cols].mean().to_dict() if numeric_cols else {}
+    if "is_holiday" in merged.columns:
+        fill_values["is_holiday"] = 0
+    if fill_values:
+        merged = merged.fillna(fill_values)
 
     return merged
@@ -7,7 +7,7 @@ import pandas as pd
 def load_csv_or_excel(path: str | Path) -> pd.DataFrame:
     p = Path(path)
     if p.suffix.lower() in {".xlsx", ".xls"}:
-        return pd.read_excel(p)
+        return pd.read_excel(p, engine="calamine")
     return pd.read_csv(p)
 
 
@@ -1,38 +1,52 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
 
+from ..feature_store.registry import resolve_dataset
 
-BASE_DIR = Path(__file__).resolve().parents[3]
-DATA_DIR = BASE_DIR / "data"
-UPLOAD_DIR = DATA_DIR / "uploads"
 
+def _signals_path() -> Path:
+    path = resolve_dataset("external_signals")
+    if not path.exists():
+        raise FileNotFoundError(f"External signals file not found at {path}")
+    return path
 
-def load_external_signals() -> pd.DataFrame:
-    sample_path = DATA_DIR / "sample_external_signals.csv"
-    upload_path = UPLOAD_DIR / "external_signals.csv"
 
-    if upload_path.exists():
-        path = upload_path
-    else:
-        path = sample_path
+@lru_cache(maxsize=4)
+def _read_signals(path_str: str, mtime_ns: int) -> pd.DataFrame:
+    path = Path(path_str)
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path)
+        df["date"] = pd.to_datetime(df["date"])
+        return df
 
-    if not path.exists():
-        raise FileNotFoundError(f"External signals file not found at {path}")
+    return pd.read_csv(path, parse_dates=["date"])
 
-    df = pd.read_csv(path, parse_dates=["date"])
-    return df
+
+def load_external_signals() -> pd.DataFrame:
+    # The parsed frame is cached per (path, mtime) and shared between callers,
+    # so treat it as read-only.
+    path = _signals_path()
+    return _read_signals(str(path), path.stat().st_mtime_ns)
 
 
 def summarize_signals(location: Optional[str] = None, days: int = 14) -> str:
     try:
-        df = load_external_signals()
+        path = _signals_path()
     except FileNotFoundError:
         return ""
 
+    return _summarize_cached(location, days, str(path), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=64)
+def _summarize_cached(location: Optional[str], days: int, path_str: str, mtime_ns: int) -> str:
+    df = _read_signals(path_str, mtime_ns)
+
     if location is not None and "location" in df.columns:
         df = df[df["location"] == location]
 
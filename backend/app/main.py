@@ -1,4 +1,6 @@
 import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -8,7 +10,10 @@ from .api.v1.routes_plan import router as plan_router
 from .api.v1.routes_explain import router as explain_router
 from .api.v1.routes_scenario import router as scenario_router
 from .api.v1.routes_data import router as data_router
-from .api.v1.routes_copilot import router as copilot_router
+from .api.v1.routes_copilot import close_copilot_service, router as copilot_router
+from .api.v1.routes_flow import router as flow_router
+from .ml.forecasting import start_prophet_warmup
+from .services.store import store
 
 
 # Configure logging to show INFO level messages
@@ -19,7 +24,15 @@ logging.basicConfig(
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_prophet_warmup()
+    yield
+    await close_copilot_service()
+    store.close()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 
 app.add_middleware(
@@ -47,3 +60,4 @@ app.include_router(explain_router, prefix=settings.api_v1_prefix)
 app.include_router(scenario_router, prefix=settings.api_v1_prefix)
 app.include_router(data_router, prefix=settings.api_v1_prefix)
 app.include_router(copilot_router, prefix=settings.api_v1_prefix)
+app.include_router(flow_router, prefix=settings.api_v1_prefix)
@@ -1,5 +1,7 @@
 from typing import List
 
+import numpy as np
+
 from ..models.explain import (
     ExplainResponse,
     FeatureContribution,
@@ -9,52 +11,48 @@ from ..integrations.external_signals import summarize_signals
 from ..models.forecast import ForecastResponse
 
 
-def build_explanation(forecast: ForecastResponse) -> ExplainResponse:
-    features = [
-        "trend",
-        "seasonality",
-        "promotion",
-        "holiday",
-        "price",
-        "weather",
-    ]
+_FEATURES = (
+    "trend",
+    "seasonality",
+    "promotion",
+    "holiday",
+    "price",
+    "weather",
+)
 
-    base_weights = [0.3, 0.25, 0.2, 0.1, 0.1, 0.05]
+_BASE_WEIGHTS = np.array([0.3, 0.25, 0.2, 0.1, 0.1, 0.05], dtype="float64")
 
-    global_importance: List[FeatureContribution] = []
-    for feature, weight in zip(features, base_weights):
-        direction = "positive"
-        if feature in {"price", "weather"}:
-            direction = "negative"
-        global_importance.append(
-            FeatureContribution(
-                feature=feature,
-                importance=weight,
-                direction=direction,
-            )
-        )
+_DIRECTIONS = tuple(
+    "negative" if feature in {"price", "weather"} else "positive" for feature in _FEATURES
+)
 
-    skus = sorted({p.sku for p in forecast.points})
 
-    by_sku: List[SKUExplanation] = []
+def build_explanation(forecast: ForecastResponse) -> ExplainResponse:
+    # Every value below is derived from trusted constants, so the models are
+    # built with model_construct to skip per-object validation.
+    global_importance: List[FeatureContribution] = [
+        FeatureContribution.model_construct(feature=feature, importance=float(weight), direction=direction)
+        for feature, weight, direction in zip(_FEATURES, _BASE_WEIGHTS, _DIRECTIONS)
+    ]
+
+    # First-appearance order is deterministic (it follows the request's
+    # sku_list) and avoids sorting the SKU set.
+    skus = list(dict.fromkeys(p.sku for p in forecast.points))
 
-    for index, sku in enumerate(skus):
-        adjusted_drivers: List[FeatureContribution] = []
-        scale = 1.0 + 0.05 * float(index)
-        for contribution in global_importance:
-            adjusted_drivers.append(
-                FeatureContribution(
-                    feature=contribution.feature,
-                    importance=contribution.importance * scale,
-                    direction=contribution.direction,
-                )
-            )
-        by_sku.append(
-            SKUExplanation(
-                sku=sku,
-                top_drivers=adjusted_drivers,
-            )
+    # Row i holds the global weights scaled by 1 + 0.05 * i for the i-th SKU.
+    scales = 1.0 + 0.05 * np.arange(len(skus), dtype="float64")
+    matrix = np.outer(scales, _BASE_WEIGHTS)
+
+    by_sku: List[SKUExplanation] = [
+        SKUExplanation.model_construct(
+            sku=sku,
+            top_drivers=[
+                FeatureContribution.model_construct(feature=feature, importance=float(value), direction=direction)
+                for feature, value, direction in zip(_FEATURES, row, _DIRECTIONS)
+            ],
         )
+        for sku, row in zip(skus, matrix)
+    ]
 
     external_text = summarize_signals(location=None)
 
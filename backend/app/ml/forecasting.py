@@ -1,79 +1,326 @@
+from datetime import date
 from typing import List, Dict, Tuple
 
 import logging
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
+from joblib import Memory, Parallel, delayed
 from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
 from statsmodels.tsa.arima.model import ARIMA
 from xgboost import XGBRegressor
 
+from ..core.config import get_settings
 from ..models.forecast import (
     ForecastRequest,
     ForecastPoint,
     ForecastMetadata,
 )
-from ..feature_store.registry import load_sales_with_signals
+from ..feature_store.registry import load_sales_with_signals, sales_with_signals_version
 
 
 logger = logging.getLogger(__name__)
 
+# Shared by every call (and, under loky, one per worker process) so thread
+# start-up is paid once rather than per SKU.
+_MODEL_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="forecast-model")
+
+# Fitted models are memoised on the raw bytes of the history they were trained
+# on, so an unchanged series (repeated requests, scenario runs) only pays for
+# prediction. A changed history produces a new key and the stale model simply
+# ages out of the LRU.
+_FIT_CACHE_SIZE = 512
+
+# Below the in-process LRU, trained models are also persisted on disk so a
+# restarted server (or a recycled loky worker) does not refit unchanged
+# histories. Bump the version whenever a model's hyper-parameters or stored
+# representation change so entries written by older code are not reused.
+_MODEL_CODE_VERSION = "1.1.1"
+
+
+def _private_cache_dir(path: str) -> str | None:
+    # joblib unpickles whatever it finds in the cache directory, so only use
+    # one that this user owns and nobody else can write to.
+    if not path:
+        return None
+    cache_dir = Path(path).expanduser()
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = cache_dir.lstat()
+        if stat.S_ISLNK(info.st_mode) or (hasattr(os, "getuid") and info.st_uid != os.getuid()):
+            logger.warning("Not using model cache %s: it is not a directory owned by this user", cache_dir)
+            return None
+        if info.st_mode & 0o077:
+            cache_dir.chmod(0o700)
+    except OSError as exc:
+        logger.warning("Not using model cache %s: %s", cache_dir, exc)
+        return None
+    return str(cache_dir)
+
+
+_MODEL_STORE = Memory(_private_cache_dir(get_settings().forecast_cache_dir), verbose=0)
+
+# Pruning walks the whole cache directory, so it runs at most this often
+# (and on the first forecast after start-up).
+_PRUNE_INTERVAL_SECONDS = 600.0
+_prune_lock = threading.Lock()
+_last_prune = float("-inf")
+
+
+def _prune_model_store() -> None:
+    global _last_prune
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        now = time.monotonic()
+        if now - _last_prune < _PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune = now
+        _MODEL_STORE.reduce_size(bytes_limit=get_settings().forecast_cache_max_bytes)
+    except OSError as exc:
+        logger.warning("Pruning the model cache failed: %s", exc)
+    finally:
+        _prune_lock.release()
+
+
+def _warm_prophet() -> None:
+    # Prophet objects cannot be refitted, so this throwaway instance only
+    # serves to load the Stan binary and cmdstanpy's lazy imports.
+    try:
+        warmup = pd.DataFrame({"ds": pd.date_range("2000-01-01", periods=2, freq="D"), "y": [0.0, 1.0]})
+        Prophet(uncertainty_samples=0).fit(warmup)
+    except Exception as exc:
+        logger.warning("Prophet warm-up failed: %s", exc)
+
+
+def _warm_processes() -> None:
+    _warm_prophet()
+    # Multi-SKU fits run in loky worker processes, each with its own Stan
+    # import, so start the full-width pool now and warm every worker. One
+    # quick task per worker lands on each of them in practice; workers that
+    # joblib spawns later (after an idle timeout or a resize) still pay on
+    # their first fit.
+    n_workers = _n_jobs(os.cpu_count() or 1)
+    if n_workers > 1:
+        try:
+            Parallel(n_jobs=n_workers, backend="loky")(delayed(_warm_prophet)() for _ in range(n_workers))
+        except Exception as exc:
+            logger.warning("Prophet warm-up of the worker processes failed: %s", exc)
+
+
+def start_prophet_warmup() -> threading.Thread:
+    """Pay the first-Prophet-fit cost in a background thread.
+
+    Warms the API process and the loky fit workers. Called from the API
+    startup hook rather than at import, so scripts and test collection do not
+    start a Stan fit, and on a dedicated thread so the validation pool stays
+    free for real requests.
+    """
+    thread = threading.Thread(target=_warm_processes, name="prophet-warmup", daemon=True)
+    thread.start()
+    return thread
+
 
 def _generate_stub_forecast(base: float, horizon: int) -> np.ndarray:
     if horizon <= 0:
         return np.asarray([], dtype="float64")
 
     steps = np.linspace(0.0, 2.5 * np.pi, horizon, endpoint=False, dtype="float64")
-    seasonal = 0.12 * np.sin(steps)
-    trend = np.linspace(-0.08, 0.08, horizon, dtype="float64")
-    raw = base * (1.0 + seasonal + trend)
-    noise = 0.05 * base * np.sin(steps * 1.7)
-    values = raw + noise
 
-    return np.maximum(values, 0.0)
+    # base * (1 + 0.12 * sin(s) + trend + 0.05 * sin(1.7 * s)), accumulated in
+    # place so only two horizon-sized buffers are ever allocated.
+    values = np.sin(steps)
+    values *= 0.12
+    values += np.linspace(-0.08, 0.08, horizon, dtype="float64")
+    steps *= 1.7
+    np.sin(steps, out=steps)
+    steps *= 0.05
+    values += steps
+    values += 1.0
+    values *= base
+
+    return np.maximum(values, 0.0, out=values)
 
 
 def _compute_mape(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     mask = y_true > 0
     if not np.any(mask):
         return np.inf
-    return float(np.mean(np.abs((y_true[mask] - y_pred[mask]) / y_true[mask])))
+    ratio = np.subtract(y_true, y_pred, dtype="float64")
+    np.divide(ratio, y_true, out=ratio, where=mask)
+    np.abs(ratio, out=ratio)
+    return float(ratio.mean(where=mask))
 
 
 def _compute_mae(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     if y_true.size == 0 or y_pred.size == 0:
         return float("inf")
-    return float(np.mean(np.abs(y_true - y_pred)))
+    diff = np.subtract(y_true, y_pred, dtype="float64")
+    np.abs(diff, out=diff)
+    return float(diff.mean())
 
 
-def _prepare_history(
-    sku: str,
-    location: str | None,
-) -> pd.Series:
+@lru_cache(maxsize=8)
+def _daily_histories(version: str, location: str | None) -> Dict[str, pd.Series]:
+    # ``version`` only keys the cache: it changes whenever the underlying sales
+    # or signals files do, so a new upload is picked up on the next request.
     df = load_sales_with_signals()
-    logger.info("load_sales_with_signals returned %d rows, columns=%s", len(df), list(df.columns))
-    logger.info("Available SKUs: %s", df["sku"].unique().tolist() if "sku" in df.columns else "NO SKU COLUMN")
-    
-    df = df[df["sku"] == sku]
-    logger.info("After filtering sku=%s: %d rows", sku, len(df))
-    
-    if location is not None:
-        # Only filter by location if that value actually appears; otherwise
-        # fall back to using all locations for this SKU so forecasting still
+    # Logging arguments are evaluated before the level check, so keep the
+    # column listing and the unique() scan off the path when INFO is off.
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("load_sales_with_signals returned %d rows, columns=%s", len(df), list(df.columns))
+        logger.info("Available SKUs: %s", df["sku"].unique().tolist() if "sku" in df.columns else "NO SKU COLUMN")
+
+    if location is not None and "location" in df.columns:
+        # Only filter a SKU by location if it actually has rows there;
+        # otherwise fall back to all of its locations so forecasting still
         # has a non-empty history.
-        if "location" in df.columns and (df["location"] == location).any():
-            df = df[df["location"] == location]
+        at_location = df["location"] == location
+        skus_at_location = df.loc[at_location, "sku"].unique()
+        df = df[at_location | ~df["sku"].isin(skus_at_location)]
 
-    if df.empty:
-        logger.warning("No data found for sku=%s, location=%s", sku, location)
-        return pd.Series(dtype="float64")
+    daily = df.groupby(["sku", "date"])["quantity"].sum()
+    return {sku: group.droplevel("sku") for sku, group in daily.groupby(level="sku", sort=False)}
 
-    daily = (
-        df.groupby("date")["quantity"]
-        .sum()
-        .sort_index()
+
+def _prepare_all_histories(sku_list: List[str], location: str | None) -> Dict[str, pd.Series]:
+    """Return the daily quantity history of every requested SKU.
+
+    The sales table is loaded and grouped once per dataset version and
+    location rather than once per SKU; unknown SKUs map to an empty series.
+    """
+
+    histories = _daily_histories(sales_with_signals_version(), location)
+    prepared: Dict[str, pd.Series] = {}
+    log_info = logger.isEnabledFor(logging.INFO)
+    for sku in sku_list:
+        history = histories.get(sku)
+        if history is None:
+            logger.warning("No data found for sku=%s, location=%s", sku, location)
+            history = pd.Series(dtype="float64")
+        elif log_info:
+            logger.info("Prepared history for sku=%s: %d daily points", sku, len(history))
+        prepared[sku] = history
+    return prepared
+
+
+def _values_key(series: pd.Series) -> bytes:
+    # Only converts when the history is not already float64; tobytes() makes
+    # the one copy the key needs.
+    return np.ascontiguousarray(series.values, dtype="float64").tobytes()
+
+
+def _dates_key(series: pd.Series) -> bytes:
+    return series.index.values.astype("datetime64[ns]").tobytes()
+
+
+# The _train_* functions are the disk-cached fits; code_version only takes part
+# in the cache key. The _fit_* wrappers add the in-process LRU on top.
+@_MODEL_STORE.cache
+def _train_arima(values: bytes, code_version: str):
+    endog = np.frombuffer(values, dtype="float64")
+    # An AR term is poorly identified on very short series and its Hessian
+    # tends to be singular, so fall back to a plain IMA(1, 1) there.
+    order = (1, 1, 1) if len(endog) >= 20 else (0, 1, 1)
+    model = ARIMA(endog, order=order)
+    # The results object is only used for forecast(); skip the parameter
+    # covariance and the smoothed state it would otherwise compute and keep.
+    return model.fit(method_kwargs={"maxiter": 20, "disp": 0}, cov_type="none", low_memory=True)
+
+
+@_MODEL_STORE.cache
+def _train_prophet(dates: bytes, values: bytes, code_version: str) -> str:
+    df = pd.DataFrame(
+        {
+            "ds": np.frombuffer(dates, dtype="datetime64[ns]"),
+            "y": np.frombuffer(values, dtype="float64"),
+        }
     )
-    logger.info("Prepared history for sku=%s: %d daily points", sku, len(daily))
-    return daily
+    # History is one point per day, so there is no intraday signal for a
+    # daily seasonality to pick up, and only yhat is read back: skipping the
+    # uncertainty simulation is what keeps predict() cheap.
+    m = Prophet(
+        daily_seasonality=False,
+        weekly_seasonality=True,
+        yearly_seasonality=len(df) >= 2 * 365,
+        mcmc_samples=0,
+        uncertainty_samples=0,
+    )
+    m.fit(df)
+    # Stored as Prophet's own JSON rather than a pickle, which does not survive
+    # Prophet upgrades reliably.
+    return model_to_json(m)
+
+
+def _xgb_regressor() -> XGBRegressor:
+    return XGBRegressor(
+        n_estimators=50,
+        max_depth=2,
+        learning_rate=0.1,
+        objective="reg:squarederror",
+        subsample=0.9,
+        colsample_bytree=1.0,
+    )
+
+
+@_MODEL_STORE.cache
+def _train_xgb(values: bytes, code_version: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit the one-lag XGBoost regressor and return it as a step function.
+
+    With a single input feature every tree splits on the same axis, so the
+    whole ensemble is piecewise constant between the sorted split thresholds.
+    Returns ``(thresholds, levels)`` where ``levels[i]`` is the model output for
+    inputs with exactly ``i`` thresholds ``<=`` them; evaluating the table is
+    exact, and the recursive forecast no longer has to call into XGBoost.
+    """
+
+    # XGBoost stores features and labels as float32 internally, so hand it
+    # float32 up front instead of letting it make its own downcast copy.
+    values_arr = np.frombuffer(values, dtype="float64").astype("float32")
+    # One lag feature: predict each value from the one before it.
+    X_arr = values_arr[:-1, None]
+    y_arr = values_arr[1:]
+
+    model = _xgb_regressor()
+    model.fit(X_arr, y_arr)
+
+    booster = model.get_booster()
+    # XGBoost compares float32 inputs against float32 thresholds (x < t goes
+    # left), so each interval is represented by its lower threshold and the
+    # one below all thresholds by the next float32 under the first. (Past
+    # 2**24, ``t - 1.0`` rounds back to ``t`` in float32.)
+    splits = booster.trees_to_dataframe()["Split"].dropna().to_numpy(dtype="float32")
+    thresholds = np.unique(splits)
+    if thresholds.size:
+        below = np.nextafter(thresholds[:1], np.float32(-np.inf))
+    else:
+        below = np.zeros(1, dtype="float32")
+    representatives = np.concatenate([below, thresholds]).astype("float32")
+    levels = booster.inplace_predict(representatives[:, None]).astype("float64")
+    return thresholds, levels
+
+
+@lru_cache(maxsize=_FIT_CACHE_SIZE)
+def _fit_arima(values: bytes):
+    return _train_arima(values, _MODEL_CODE_VERSION)
+
+
+@lru_cache(maxsize=_FIT_CACHE_SIZE)
+def _fit_prophet(dates: bytes, values: bytes) -> Prophet:
+    return model_from_json(_train_prophet(dates, values, _MODEL_CODE_VERSION))
+
+
+@lru_cache(maxsize=_FIT_CACHE_SIZE)
+def _fit_xgb(values: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    return _train_xgb(values, _MODEL_CODE_VERSION)
 
 
 def _forecast_arima(series: pd.Series, horizon: int) -> np.ndarray | None:
@@ -81,10 +328,10 @@ def _forecast_arima(series: pd.Series, horizon: int) -> np.ndarray | None:
         logger.warning("ARIMA skipped: len=%d < 4 or horizon=%d <= 0", len(series), horizon)
         return None
     try:
-        model = ARIMA(series.values.astype("float64"), order=(1, 1, 1))
-        res = model.fit()
+        res = _fit_arima(_values_key(series))
         fc = res.forecast(steps=horizon)
-        logger.info("ARIMA success: len=%d, horizon=%d, fc_mean=%.2f", len(series), horizon, float(np.mean(fc)))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("ARIMA success: len=%d, horizon=%d, fc_mean=%.2f", len(series), horizon, float(np.mean(fc)))
         return np.maximum(fc, 0.0)
     except Exception as exc:
         logger.warning("ARIMA forecast failed (len=%d, horizon=%d): %s", len(series), horizon, exc)
@@ -96,12 +343,11 @@ def _forecast_prophet(series: pd.Series, horizon_dates: pd.DatetimeIndex) -> np.
         logger.warning("Prophet skipped: len=%d < 4 or horizon=%d == 0", len(series), len(horizon_dates))
         return None
     try:
-        df = pd.DataFrame({"ds": series.index, "y": series.values})
-        m = Prophet(daily_seasonality=True, weekly_seasonality=True, yearly_seasonality=False)
-        m.fit(df)
+        m = _fit_prophet(_dates_key(series), _values_key(series))
         future = pd.DataFrame({"ds": horizon_dates})
         fc = m.predict(future)["yhat"].values
-        logger.info("Prophet success: len=%d, horizon=%d, fc_mean=%.2f", len(series), len(horizon_dates), float(np.mean(fc)))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Prophet success: len=%d, horizon=%d, fc_mean=%.2f", len(series), len(horizon_dates), float(np.mean(fc)))
         return np.maximum(fc, 0.0)
     except Exception as exc:
         logger.warning("Prophet forecast failed (len=%d, horizon=%d): %s", len(series), len(horizon_dates), exc)
@@ -112,38 +358,49 @@ def _forecast_xgb(series: pd.Series, horizon: int) -> np.ndarray | None:
     if len(series) < 6 or horizon <= 0:
         logger.warning("XGBoost skipped: len=%d < 6 or horizon=%d <= 0", len(series), horizon)
         return None
+    try:
+        thresholds, levels = _fit_xgb(_values_key(series))
+
+        # Each prediction feeds back in as the next input; walking the step
+        # table gives the same values as calling model.predict per step.
+        history = float(series.values[-1])
+        forecasts = np.empty(horizon, dtype="float64")
+        for i in range(horizon):
+            history = max(float(levels[np.searchsorted(thresholds, np.float32(history), side="right")]), 0.0)
+            forecasts[i] = history
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("XGBoost success: len=%d, horizon=%d, fc_mean=%.2f", len(series), horizon, float(np.mean(forecasts)))
+        return forecasts
+    except Exception as exc:
+        logger.warning("XGBoost forecast failed (len=%d, horizon=%d): %s", len(series), horizon, exc)
+        return None
+
+
+def _forecast_ar1(series: pd.Series, horizon: int) -> np.ndarray | None:
+    """Forecast with a one-lag linear autoregression fitted by least squares.
+
+    This is the model the single-lag XGBoost regressor approximates, at the
+    cost of one polyfit instead of a boosted ensemble, so it is the default
+    autoregressive candidate. XGBoost stays available via forced_model.
+    """
+
+    if len(series) < 6 or horizon <= 0:
+        logger.warning("AR(1) skipped: len=%d < 6 or horizon=%d <= 0", len(series), horizon)
+        return None
     try:
         values = series.values.astype("float64")
-        X: list[list[float]] = []
-        y: list[float] = []
-        for i in range(1, len(values)):
-            X.append([values[i - 1]])
-            y.append(values[i])
-
-        X_arr = np.asarray(X)
-        y_arr = np.asarray(y)
-
-        model = XGBRegressor(
-            n_estimators=50,
-            max_depth=2,
-            learning_rate=0.1,
-            objective="reg:squarederror",
-            subsample=0.9,
-            colsample_bytree=1.0,
-        )
-        model.fit(X_arr, y_arr)
+        beta, intercept = np.polyfit(values[:-1], values[1:], 1)
 
+        forecasts = np.empty(horizon, dtype="float64")
         history = float(values[-1])
-        forecasts: list[float] = []
-        for _ in range(horizon):
-            pred = float(model.predict(np.array([[history]], dtype="float64"))[0])
-            pred = max(pred, 0.0)
-            forecasts.append(pred)
-            history = pred
-        logger.info("XGBoost success: len=%d, horizon=%d, fc_mean=%.2f", len(series), horizon, float(np.mean(forecasts)))
-        return np.asarray(forecasts, dtype="float64")
+        for i in range(horizon):
+            history = max(intercept + beta * history, 0.0)
+            forecasts[i] = history
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("AR(1) success: len=%d, horizon=%d, fc_mean=%.2f", len(series), horizon, float(np.mean(forecasts)))
+        return forecasts
     except Exception as exc:
-        logger.warning("XGBoost forecast failed (len=%d, horizon=%d): %s", len(series), horizon, exc)
+        logger.warning("AR(1) forecast failed (len=%d, horizon=%d): %s", len(series), horizon, exc)
         return None
 
 
@@ -154,9 +411,10 @@ def _select_model_and_forecast(
 ) -> Tuple[np.ndarray, str, Dict[str, float]]:
     """Select and run a forecast model.
 
-    If forced_model is provided ("arima", "prophet", "xgboost", "stub"), we try that
-    first. Otherwise we compute validation metrics (MAPE/MAE) and pick the best model
-    by MAPE.
+    If forced_model is provided ("arima", "prophet", "ar1", "xgboost", "stub"), only
+    that model is fitted and no validation metrics are returned. Otherwise we compute
+    validation metrics (MAPE/MAE) for ARIMA, Prophet and AR(1) and pick the best
+    model by MAPE.
     """
 
     horizon = len(horizon_dates)
@@ -164,6 +422,29 @@ def _select_model_and_forecast(
         base = float(series.mean()) if len(series) > 0 else 100.0
         return _generate_stub_forecast(base, horizon), "stub", {}
 
+    def _forecast_with_name(name: str) -> Tuple[np.ndarray | None, str]:
+        if name == "arima":
+            return _forecast_arima(series, horizon), "arima"
+        if name == "prophet":
+            return _forecast_prophet(series, horizon_dates), "prophet"
+        if name == "ar1":
+            return _forecast_ar1(series, horizon), "ar1"
+        if name == "xgboost":
+            return _forecast_xgb(series, horizon), "xgboost"
+        if name == "stub":
+            base = float(series.mean()) if len(series) > 0 else 100.0
+            return _generate_stub_forecast(base, horizon), "stub"
+        return None, "stub"
+
+    # If caller forced a model, honour that without running validation: the
+    # other candidates' scores would never be used, so metrics stay empty.
+    if forced_model in {"arima", "prophet", "ar1", "xgboost", "stub"}:
+        final_fc, chosen = _forecast_with_name(forced_model)
+        if final_fc is None:
+            base = float(series.mean()) if len(series) > 0 else 100.0
+            return _generate_stub_forecast(base, horizon), "stub", {}
+        return final_fc, chosen, {}
+
     n_val = min(3, max(1, len(series) // 4))
     train = series.iloc[:-n_val]
     val_true = series.iloc[-n_val:].values.astype("float64")
@@ -172,43 +453,31 @@ def _select_model_and_forecast(
 
     logger.info("Computing validation metrics: train_len=%d, val_len=%d", len(train), n_val)
     
-    arima_val = _forecast_arima(train, n_val)
+    # ARIMA and Prophet spend most of their time in native code (LAPACK, Stan)
+    # that releases the GIL, so fit them concurrently; AR(1) is a single
+    # polyfit and just runs inline meanwhile.
+    arima_future = _MODEL_POOL.submit(_forecast_arima, train, n_val)
+    prophet_future = _MODEL_POOL.submit(
+        _forecast_prophet, train, pd.date_range(start=train.index[-n_val], periods=n_val, freq="D")
+    )
+    ar1_val = _forecast_ar1(train, n_val)
+
+    arima_val = arima_future.result()
     if arima_val is not None:
         metrics["arima_mape"] = _compute_mape(val_true, arima_val)
         metrics["arima_mae"] = _compute_mae(val_true, arima_val)
         logger.info("ARIMA validation: mape=%.2f%%, mae=%.2f", metrics["arima_mape"] * 100, metrics["arima_mae"])
 
-    prophet_val = _forecast_prophet(train, pd.date_range(start=train.index[-n_val], periods=n_val, freq="D"))
+    prophet_val = prophet_future.result()
     if prophet_val is not None:
         metrics["prophet_mape"] = _compute_mape(val_true, prophet_val)
         metrics["prophet_mae"] = _compute_mae(val_true, prophet_val)
         logger.info("Prophet validation: mape=%.2f%%, mae=%.2f", metrics["prophet_mape"] * 100, metrics["prophet_mae"])
 
-    xgb_val = _forecast_xgb(train, n_val)
-    if xgb_val is not None:
-        metrics["xgb_mape"] = _compute_mape(val_true, xgb_val)
-        metrics["xgb_mae"] = _compute_mae(val_true, xgb_val)
-        logger.info("XGBoost validation: mape=%.2f%%, mae=%.2f", metrics["xgb_mape"] * 100, metrics["xgb_mae"])
-
-    def _forecast_with_name(name: str) -> Tuple[np.ndarray | None, str]:
-        if name == "arima":
-            return _forecast_arima(series, horizon), "arima"
-        if name == "prophet":
-            return _forecast_prophet(series, horizon_dates), "prophet"
-        if name == "xgboost":
-            return _forecast_xgb(series, horizon), "xgboost"
-        if name == "stub":
-            base = float(series.mean()) if len(series) > 0 else 100.0
-            return _generate_stub_forecast(base, horizon), "stub"
-        return None, "stub"
-
-    # If caller forced a model, honour that first
-    if forced_model in {"arima", "prophet", "xgboost", "stub"}:
-        final_fc, chosen = _forecast_with_name(forced_model)
-        if final_fc is None:
-            base = float(series.mean()) if len(series) > 0 else 100.0
-            return _generate_stub_forecast(base, horizon), "stub", metrics
-        return final_fc, chosen, metrics
+    if ar1_val is not None:
+        metrics["ar1_mape"] = _compute_mape(val_true, ar1_val)
+        metrics["ar1_mae"] = _compute_mae(val_true, ar1_val)
+        logger.info("AR(1) validation: mape=%.2f%%, mae=%.2f", metrics["ar1_mape"] * 100, metrics["ar1_mae"])
 
     # Auto-selection based on MAPE
     if not metrics:
@@ -220,8 +489,8 @@ def _select_model_and_forecast(
         score_candidates["arima"] = metrics["arima_mape"]
     if "prophet_mape" in metrics:
         score_candidates["prophet"] = metrics["prophet_mape"]
-    if "xgb_mape" in metrics:
-        score_candidates["xgboost"] = metrics["xgb_mape"]
+    if "ar1_mape" in metrics:
+        score_candidates["ar1"] = metrics["ar1_mape"]
 
     if not score_candidates:
         base = float(series.mean()) if len(series) > 0 else 100.0
@@ -236,6 +505,73 @@ def _select_model_and_forecast(
     return final_fc, chosen, metrics
 
 
+def _forecast_one_sku(
+    sku: str,
+    history: pd.Series,
+    request: ForecastRequest,
+    date_index: pd.DatetimeIndex,
+    dates: List[date],
+) -> Tuple[str, List[ForecastPoint], str, Dict[str, float]]:
+    """Forecast a single SKU from its prepared history.
+
+    Kept free of shared state and IO so it can run in a separate worker process.
+    """
+
+    if history.empty:
+        base_level = 100.0
+        mean_values = _generate_stub_forecast(base_level, len(date_index))
+        chosen_model = "stub"
+        metrics: Dict[str, float] = {}
+    else:
+        fc_values, chosen_model, metrics = _select_model_and_forecast(
+            history,
+            date_index,
+            getattr(request, "forced_model", None),
+        )
+        mean_values = fc_values
+
+    logger.info(
+        "Forecast model for sku=%s: chosen=%s forced=%s metrics=%s history_len=%d horizon=%d",
+        sku,
+        chosen_model,
+        getattr(request, "forced_model", None),
+        metrics,
+        len(history),
+        len(date_index),
+    )
+
+    # Quantiles are fixed multiples of the mean, so compute them as arrays and
+    # build the points with model_construct: every field is already a plain
+    # str/date/float here, so per-point validation would only cost time.
+    means = np.asarray(mean_values, dtype="float64")
+    points: List[ForecastPoint] = [
+        ForecastPoint.model_construct(sku=sku, date=day, mean=mean, q10=q10, q50=mean, q90=q90)
+        for day, mean, q10, q90 in zip(
+            dates, means.tolist(), (means * 0.8).tolist(), (means * 1.2).tolist()
+        )
+    ]
+
+    return sku, points, chosen_model, metrics
+
+
+# Numeric codes for the chosen model, reported in the per-SKU metrics.
+_MODEL_CODES: Dict[str, float] = {
+    "stub": 0.0,
+    "arima": 1.0,
+    "prophet": 2.0,
+    "xgboost": 3.0,
+    "ar1": 4.0,
+}
+
+
+def _n_jobs(n_skus: int) -> int:
+    configured = get_settings().forecast_n_jobs
+    available = os.cpu_count() or 1
+    if configured <= 0:
+        configured = available
+    return max(1, min(configured, n_skus))
+
+
 def generate_ensemble_forecast(
     request: ForecastRequest,
 ) -> Tuple[List[ForecastPoint], ForecastMetadata, Dict[str, float]]:
@@ -244,71 +580,71 @@ def generate_ensemble_forecast(
         end=request.end_date,
         freq=request.granularity.value,
     )
+    # Every SKU shares the same calendar, so convert it to dates only once.
+    dates = date_index.date.tolist()
 
     points: List[ForecastPoint] = []
     global_metrics: Dict[str, float] = {}
     per_sku_model: Dict[str, str] = {}
 
-    for sku in request.sku_list:
-        history = _prepare_history(sku=sku, location=request.location)
-
-        if history.empty:
-            base_level = 100.0
-            mean_values = _generate_stub_forecast(base_level, len(date_index))
-            chosen_model = "stub"
-            metrics: Dict[str, float] = {}
-        else:
-            fc_values, chosen_model, metrics = _select_model_and_forecast(
-                history,
-                date_index,
-                getattr(request, "forced_model", None),
-            )
-            mean_values = fc_values
-
-        logger.info(
-            "Forecast model for sku=%s: chosen=%s forced=%s metrics=%s history_len=%d horizon=%d",
-            sku,
-            chosen_model,
-            getattr(request, "forced_model", None),
-            metrics,
-            len(history),
-            len(date_index),
+    # SKUs are independent, so fit them in parallel worker processes. joblib
+    # keeps the loky executor alive between calls, so repeated requests reuse
+    # warm workers instead of re-importing Prophet/XGBoost each time.
+    histories = _prepare_all_histories(request.sku_list, request.location)
+    n_jobs = _n_jobs(len(request.sku_list))
+    if n_jobs == 1:
+        results = [
+            _forecast_one_sku(sku, histories[sku], request, date_index, dates)
+            for sku in request.sku_list
+        ]
+    else:
+        results = Parallel(n_jobs=n_jobs, backend="loky")(
+            delayed(_forecast_one_sku)(sku, histories[sku], request, date_index, dates)
+            for sku in request.sku_list
         )
 
+    # Results come back in sku_list order, so the merge stays deterministic.
+    for sku, sku_points, chosen_model, metrics in results:
         per_sku_model[sku] = chosen_model
 
         for key, value in metrics.items():
             global_metrics[f"{sku}.{key}"] = value
 
-        for ts, mean in zip(date_index, mean_values):
-            q50 = float(mean)
-            q10 = float(mean * 0.8)
-            q90 = float(mean * 1.2)
-
-            points.append(
-                ForecastPoint(
-                    sku=sku,
-                    date=ts.date(),
-                    mean=float(mean),
-                    q10=q10,
-                    q50=q50,
-                    q90=q90,
-                )
-            )
-
-        global_metrics[f"{sku}.chosen_model"] = {
-            "stub": 0.0,
-            "arima": 1.0,
-            "prophet": 2.0,
-            "xgboost": 3.0,
-        }.get(chosen_model, -1.0)
+        points.extend(sku_points)
+
+        global_metrics[f"{sku}.chosen_model"] = _MODEL_CODES.get(chosen_model, -1.0)
+
+    _prune_model_store()
 
     metadata = ForecastMetadata(
-        model_name="arima_prophet_xgb_ensemble",
-        model_version="1.0.0",
-        components=["arima", "prophet", "xgboost"],
-        notes="Per-SKU model selection with ARIMA, Prophet, and XGBoost; quantiles approximated from mean.",
+        model_name="arima_prophet_ar1_ensemble",
+        model_version=_MODEL_CODE_VERSION,
+        components=["arima", "prophet", "ar1"],
+        notes=(
+            "Per-SKU model selection with ARIMA, Prophet, and AR(1); XGBoost available via "
+            "forced_model; quantiles approximated from mean."
+        ),
         per_sku_model=per_sku_model,
     )
 
     return points, metadata, global_metrics
+
+
+def warm_model_cache(sku_list: List[str], location: str | None = None) -> Dict[str, str]:
+    """Fit and persist the models a forecast for these SKUs would need.
+
+    Fits do not depend on the requested horizon, so running the selection on
+    a one-day horizon trains every validation candidate plus the chosen final
+    model. Returns the model selected for each SKU.
+    """
+
+    histories = _prepare_all_histories(sku_list, location)
+    chosen: Dict[str, str] = {}
+    for sku, history in histories.items():
+        if history.empty:
+            chosen[sku] = "stub"
+            continue
+        next_day = pd.date_range(start=history.index[-1] + pd.Timedelta(days=1), periods=1, freq="D")
+        _, chosen[sku], _ = _select_model_and_forecast(history, next_day)
+    _prune_model_store()
+    return chosen
@@ -1,7 +1,8 @@
-from collections import defaultdict
 from datetime import date
 from typing import Dict, List, Tuple
 
+import numpy as np
+
 from ..models.forecast import ForecastPoint
 from ..models.plan import InventoryConstraints
 
@@ -9,25 +10,35 @@ from ..models.plan import InventoryConstraints
 def summarize_demand(
     points: List[ForecastPoint],
 ) -> Tuple[Dict[str, float], date | None, date | None]:
-    demand_by_sku: Dict[str, float] = defaultdict(float)
-    min_date: date | None = None
-    max_date: date | None = None
+    if not points:
+        return {}, None, None
+
+    # Pull the three fields out in one pass each, then group in NumPy instead
+    # of updating a dict and two running extrema per point.
+    means = np.fromiter((p.mean for p in points), dtype="float64", count=len(points))
+    skus = np.array([p.sku for p in points])
+    dates = np.array([p.date for p in points], dtype="datetime64[D]")
+
+    unique_skus, first_seen, inverse = np.unique(skus, return_index=True, return_inverse=True)
+    totals = np.bincount(inverse, weights=means, minlength=len(unique_skus))
 
-    for p in points:
-        demand_by_sku[p.sku] += p.mean
-        if min_date is None or p.date < min_date:
-            min_date = p.date
-        if max_date is None or p.date > max_date:
-            max_date = p.date
+    # np.unique sorts; restore first-appearance order so plans list SKUs in
+    # the same order as the forecast.
+    order = np.argsort(first_seen, kind="stable")
+    demand_by_sku: Dict[str, float] = dict(
+        zip(unique_skus[order].tolist(), totals[order].tolist())
+    )
 
-    return demand_by_sku, min_date, max_date
+    return demand_by_sku, dates.min().item(), dates.max().item()
 
 
 def compute_safety_stock_for_sku(
-    total_demand: float,
+    total_demand: float | np.ndarray,
     horizon_days: int,
     constraints: InventoryConstraints,
-) -> float:
+) -> float | np.ndarray:
+    # Pure element-wise arithmetic, so an array of per-SKU demand totals
+    # yields the matching array of safety stocks.
     if horizon_days <= 0:
         return 0.0
 
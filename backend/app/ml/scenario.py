@@ -8,20 +8,22 @@ def compute_scenario_kpis(
     plan: PlanResponse,
     request: ScenarioRequest,
 ) -> List[ScenarioKPI]:
-    base_volume = sum(o.quantity for o in plan.orders) + sum(
-        p.quantity for p in plan.production
-    )
-
-    demand_factors = [
-        shock.factor
-        for shock in request.shocks
-        if shock.type == ScenarioShockType.demand
-    ]
-
-    if demand_factors:
-        demand_factor = sum(demand_factors) / float(len(demand_factors))
-    else:
-        demand_factor = 1.0
+    # Single pass over each list, accumulating into locals.
+    base_volume = 0.0
+    for order in plan.orders:
+        base_volume += order.quantity
+    for item in plan.production:
+        base_volume += item.quantity
+
+    demand = ScenarioShockType.demand
+    demand_sum = 0.0
+    demand_count = 0
+    for shock in request.shocks:
+        if shock.type == demand:
+            demand_sum += shock.factor
+            demand_count += 1
+
+    demand_factor = demand_sum / float(demand_count) if demand_count else 1.0
 
     scenario_volume = base_volume * demand_factor
     delta_volume = scenario_volume - base_volume
@@ -1,6 +1,7 @@
-from datetime import date
 from typing import List, Tuple, Optional
 
+import numpy as np
+
 from ..models.forecast import ForecastPoint
 from ..models.plan import (
     InventoryConstraints,
@@ -23,44 +24,40 @@ def generate_supply_plan(
 
     horizon_days = (max_date - min_date).days + 1
 
-    orders: List[RecommendedOrder] = []
-    production: List[ProductionRecommendation] = []
+    # The plan arithmetic is the same for every SKU, so do it on arrays and
+    # only build the (already valid) records at the end.
+    skus = list(demand_by_sku)
+    total_demand = np.fromiter(demand_by_sku.values(), dtype="float64", count=len(skus))
+    safety_stock = compute_safety_stock_for_sku(total_demand, horizon_days, constraints)
+    total_required = total_demand + safety_stock
 
-    total_volume = 0.0
+    purchase_quantity = total_required * 0.4
+    production_quantity = total_required * 0.6
 
-    for sku, total_demand in demand_by_sku.items():
-        safety_stock = compute_safety_stock_for_sku(
-            total_demand,
-            horizon_days,
-            constraints,
+    orders: List[RecommendedOrder] = [
+        RecommendedOrder.model_construct(
+            sku=sku,
+            location=location,
+            order_date=min_date,
+            quantity=quantity,
+            order_type="purchase",
         )
-        total_required = total_demand + safety_stock
-
-        purchase_quantity = total_required * 0.4
-        production_quantity = total_required * 0.6
-
-        if purchase_quantity > 0.0:
-            orders.append(
-                RecommendedOrder(
-                    sku=sku,
-                    location=location,
-                    order_date=min_date,
-                    quantity=purchase_quantity,
-                    order_type="purchase",
-                )
-            )
+        for sku, quantity in zip(skus, purchase_quantity.tolist())
+        if quantity > 0.0
+    ]
 
-        if production_quantity > 0.0:
-            production.append(
-                ProductionRecommendation(
-                    sku=sku,
-                    line_id="LINE-1",
-                    production_date=min_date,
-                    quantity=production_quantity,
-                )
-            )
+    production: List[ProductionRecommendation] = [
+        ProductionRecommendation.model_construct(
+            sku=sku,
+            line_id="LINE-1",
+            production_date=min_date,
+            quantity=quantity,
+        )
+        for sku, quantity in zip(skus, production_quantity.tolist())
+        if quantity > 0.0
+    ]
 
-        total_volume += total_required
+    total_volume = float(total_required.sum())
 
     kpis: List[PlanKPI] = [
         PlanKPI(name="Total Volume", value=total_volume, unit="units"),
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .explain import ExplainResponse
+from .forecast import ForecastRequest
+from .plan import InventoryConstraints, PlanObjective
+from .scenario import ScenarioKPI, ScenarioShock
+
+
+class FlowPlanOptions(BaseModel):
+    objective: PlanObjective = PlanObjective.service_level
+    constraints: InventoryConstraints = InventoryConstraints()
+    location: Optional[str] = None
+
+
+class FlowScenarioOptions(BaseModel):
+    name: Optional[str] = None
+    shocks: List[ScenarioShock]
+
+
+class FlowRequest(BaseModel):
+    forecast: ForecastRequest
+    plan: FlowPlanOptions = FlowPlanOptions()
+    # Omitted: the flow stops after the plan and explanation.
+    scenario: Optional[FlowScenarioOptions] = None
+
+
+class FlowResponse(BaseModel):
+    forecast_id: str
+    plan_id: str
+    explain: ExplainResponse
+    scenario_id: Optional[str] = None
+    scenario_kpis: List[ScenarioKPI] = []
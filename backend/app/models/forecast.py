@@ -20,10 +20,15 @@ class ForecastRequest(BaseModel):
     granularity: TimeGranularity = TimeGranularity.day
     location: Optional[str] = None
     external_signals: Optional[Dict[str, Any]] = None
-    # Optional override for model selection: one of arima, prophet, xgboost, stub (baseline)
+    # Optional override for model selection: one of arima, prophet, ar1, xgboost, stub (baseline)
     forced_model: Optional[str] = None
 
 
+class ForecastWarmRequest(BaseModel):
+    sku_list: List[str] = Field(..., description="SKUs whose models should be pre-fitted")
+    location: Optional[str] = None
+
+
 class ForecastPoint(BaseModel):
     sku: str
     date: date
@@ -2,52 +2,205 @@ from __future__ import annotations
 
 from typing import List, Dict, Any
 
+import asyncio
 import logging
+import re
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
 from string import Template
 
-import requests
+import httpx
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from starlette.concurrency import run_in_threadpool
 
 from ..core.config import get_settings
 from ..models.copilot import CopilotContext, CopilotQueryRequest, CopilotQueryResponse
 from ..services.store import store
-from ..api.v1.routes_data import DATA_DIR, UPLOAD_DIR  # reuse dataset locations
+from ..feature_store.registry import DATASET_TYPES, resolve_dataset
 import pandas as pd
 
 
+_GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+_GROQ_RETRIES = 2
+_GROQ_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_GROQ_SYSTEM_TEMPLATE = Template(
+    "\n".join(
+        [
+            "You are the SAP IBP copilot.",
+            "Use the following planning context to answer user questions professionally.",
+            "Context summary:\n${summary}",
+        ]
+    )
+)
+
+# Matched against the lower-cased query. The lookaheads keep "help" and
+# "can you" order-independent, as two separate substring checks would be.
+_GREETING_EXACT = frozenset({"hi", "hello", "hey"})
+_GREETING_RE = re.compile(r"(?:hi|hello|hey) ")
+_CAPABILITY_RE = re.compile(r"what (?:can you|u can) do|^(?=.*help)(?=.*can you)", re.DOTALL)
+
+# Query keywords -> guidance appended to the suggested actions.
+_KEYWORD_RULES = (
+    (
+        ("risk", "downside"),
+        "Focus on the highest-volume or most volatile SKUs and stress-test them with downside scenarios.",
+    ),
+    (
+        ("inventory", "stock"),
+        "Compare forecast demand with inventory KPIs and adjust safety stock or reorder rules where needed.",
+    ),
+    (
+        ("scenario", "what if"),
+        "Create at least one upside and one downside scenario in Scenario Lab to frame the planning range.",
+    ),
+    (
+        ("data", "file", "csv", "dataset"),
+        "Inspect the uploaded dataset on the Data import tab and fix missing or unexpected columns before trusting results.",
+    ),
+)
+_KEYWORD_ACTION = {keyword: action for keywords, action in _KEYWORD_RULES for keyword in keywords}
+# The lookahead makes matches zero-width, so keywords that overlap in the
+# query (e.g. "what if" and "file" in "what ifile") are all found.
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_KEYWORD_ACTION, key=len, reverse=True)) + "))"
+)
+
+# Only the session line of the greeting / capability answer varies per
+# request; everything else is fixed text.
+_CAPABILITY_ANSWER = "\n".join(
+    [
+        "Hi! I'm your IBP AI copilot.",
+        "- Summarise the latest forecast and highlight top risk SKUs.",
+        "- Explain your current supply plan KPIs and key trade-offs.",
+        "- Describe scenarios (upside / downside) versus the base plan.",
+        "- Inspect the uploaded Sales dataset and point out its structure.",
+    ]
+)
+_GREETING_ACTIONS = (
+    "Ask me to summarise the latest forecast and highlight risk SKUs.",
+    "Ask me to explain your current plan KPIs.",
+    "Ask me to compare a scenario against the base plan.",
+    "Ask me to review the Sales dataset for basic data quality issues.",
+)
+
+
+def _used_context(request: CopilotQueryRequest) -> Dict[str, Any]:
+    return {
+        "has_forecast": bool(store.forecasts),
+        "has_plan": bool(store.plans),
+        "scenario_count": len(store.scenarios),
+        "dataset_type": request.dataset_type,
+    }
+
+
+_SUMMARY_COLUMNS = ("sku", "location", "date")
+
+
+def _read_summary_columns(path: Path) -> tuple[list[str], pa.Table]:
+    # Only the columns the summary inspects are parsed; the full column list
+    # comes from the parquet footer or the first CSV block.
+    if path.suffix == ".parquet":
+        parquet_file = pq.ParquetFile(path)
+        cols = parquet_file.schema_arrow.names
+        table = parquet_file.read(columns=[c for c in _SUMMARY_COLUMNS if c in cols])
+        return cols, table
+
+    cols = pacsv.open_csv(path).schema.names
+    # An empty include_columns means "all columns" to pyarrow, so with none
+    # of the summary columns present parse just the first one for the count.
+    wanted = [c for c in _SUMMARY_COLUMNS if c in cols] or cols[:1]
+    # Plain strings so type inference cannot fail mid-file; empty cells are
+    # null, as they would be NaN in pandas.
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(
+            include_columns=wanted,
+            column_types={c: pa.string() for c in wanted},
+            strings_can_be_null=True,
+        ),
+    )
+    return cols, table
+
+
+@lru_cache(maxsize=16)
+def _load_dataset_summary(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # mtime/size only key the cache so a re-upload is picked up; only the
+    # summary values are kept, never the table itself.
+    cols, table = _read_summary_columns(Path(path_str))
+    names = set(table.column_names)
+
+    summary: Dict[str, Any] = {
+        "cols": cols,
+        "n_rows": table.num_rows,
+        "n_cols": len(cols),
+        "nunique_sku": pc.count_distinct(table["sku"]).as_py() if "sku" in names else None,
+        "nunique_loc": pc.count_distinct(table["location"]).as_py() if "location" in names else None,
+        "date_min": None,
+        "date_max": None,
+    }
+    if "date" in names:
+        try:
+            dt = pd.to_datetime(table["date"].to_pandas())
+            summary["date_min"] = dt.min().date()
+            summary["date_max"] = dt.max().date()
+        except Exception:
+            pass
+    return summary
+
+
 class CopilotService:
-    def __init__(self) -> None:
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None) -> None:
         self.settings = get_settings()
+        # One pooled async client for the service's lifetime keeps the
+        # connection to the Groq API alive between queries, and awaiting it
+        # frees the event loop while the model is generating. The transport
+        # retries failed connects; status-based retries are in _call_groq_model.
+        # Tests pass their own transport instead.
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=_GROQ_RETRIES,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+        self._client = httpx.AsyncClient(timeout=30, transport=transport)
+
+    async def aclose(self) -> None:
+        """Close the pooled Groq connections; called on app shutdown."""
+        await self._client.aclose()
 
     def _summarize_forecast(self, forecast_id: str | None) -> str:
         if not store.forecasts:
             return "No forecasts are available in the current session."
 
-        if forecast_id is not None and forecast_id in store.forecasts:
-            forecast = store.forecasts[forecast_id]
-        else:
-            # take latest created
-            _, forecast = next(reversed(store.forecasts.items()))
-
-        totals: dict[str, float] = {}
-        for p in forecast.points:
-            totals[p.sku] = totals.get(p.sku, 0.0) + p.mean
-
-        parts: List[str] = []
-        parts.append(
+        with store.lock:
+            if forecast_id is not None and forecast_id in store.forecasts:
+                forecast = store.forecasts[forecast_id]
+            else:
+                # take latest created
+                _, forecast = next(reversed(store.forecasts.items()))
+            # Per-SKU totals, their top-5 ranking and the model counts are all
+            # computed once when the forecast is stored.
+            summary = store.forecast_summaries[forecast.forecast_id]
+
+        # Every fragment lands in one list and is joined exactly once.
+        parts: List[str] = [
             f"Forecast {forecast.forecast_id} uses model {forecast.metadata.model_name} "
             f"v{forecast.metadata.model_version}."
-        )
-        ranked = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+        ]
+        ranked: list[tuple[str, float]] = summary["top_skus"]
         if ranked:
-            top_lines = [f"{sku} (~{total:.1f} units)" for sku, total in ranked[:5]]
-            parts.append("Top SKUs by volume: " + ", ".join(top_lines) + ".")
+            top_lines = ", ".join([f"{sku} (~{total:.1f} units)" for sku, total in ranked])
+            parts.append(f"Top SKUs by volume: {top_lines}.")
 
         if forecast.metadata.per_sku_model:
-            model_counts: dict[str, int] = {}
-            for model in forecast.metadata.per_sku_model.values():
-                model_counts[model] = model_counts.get(model, 0) + 1
-            summary = ", ".join(f"{m}: {c} SKUs" for m, c in model_counts.items())
-            parts.append("Per-SKU model selection: " + summary + ".")
+            model_counts: list[tuple[str, int]] = summary["model_counts"]
+            selection = ", ".join([f"{m}: {c} SKUs" for m, c in model_counts])
+            parts.append(f"Per-SKU model selection: {selection}.")
 
         return " ".join(parts)
 
@@ -55,10 +208,11 @@ class CopilotService:
         if not store.plans:
             return "No plans are available in the current session."
 
-        if plan_id is not None and plan_id in store.plans:
-            plan = store.plans[plan_id]
-        else:
-            _, plan = next(reversed(store.plans.items()))
+        with store.lock:
+            if plan_id is not None and plan_id in store.plans:
+                plan = store.plans[plan_id]
+            else:
+                _, plan = next(reversed(store.plans.items()))
 
         parts: List[str] = []
         parts.append(f"Plan {plan.plan_id} is linked to forecast {plan.forecast_id}.")
@@ -92,7 +246,9 @@ class CopilotService:
         # otherwise provide a brief list overview
         parts = [f"There are {len(store.scenarios)} scenarios in the current session."]
         examples: List[str] = []
-        for scenario in list(store.scenarios.values())[:5]:
+        with store.lock:
+            first_scenarios = list(islice(store.scenarios.values(), 5))
+        for scenario in first_scenarios:
             label = scenario.name or "Scenario"
             examples.append(f"{label} ({scenario.scenario_id[:8]}...) for forecast {scenario.forecast_id}")
         if examples:
@@ -103,30 +259,18 @@ class CopilotService:
         if dataset_type is None:
             return "No dataset type specified. Choose one of sales, inventory, production, purchase_orders, master_data, external_signals."
 
-        sample_map = {
-            "sales": DATA_DIR / "sample_sales.csv",
-            "inventory": DATA_DIR / "sample_inventory.csv",
-            "production": DATA_DIR / "sample_production.csv",
-            "purchase_orders": DATA_DIR / "sample_purchase_orders.csv",
-            "master_data": DATA_DIR / "sample_master_data.csv",
-            "external_signals": DATA_DIR / "sample_external_signals.csv",
-        }
-
-        upload_path = UPLOAD_DIR / f"{dataset_type}.csv"
-        if upload_path.exists():
-            path = upload_path
-        else:
-            path = sample_map.get(dataset_type)
+        path = resolve_dataset(dataset_type) if dataset_type in DATASET_TYPES else None
 
         if path is None or not path.exists():
             return f"Dataset {dataset_type} is not available."
 
-        df = pd.read_csv(path)
-        cols = list(df.columns)
+        stat = path.stat()
+        summary = _load_dataset_summary(str(path), stat.st_mtime_ns, stat.st_size)
+        cols = summary["cols"]
         parts: List[str] = []
 
-        n_rows = len(df)
-        n_cols = len(cols)
+        n_rows = summary["n_rows"]
+        n_cols = summary["n_cols"]
         preview_cols = cols[:6]
         extra = n_cols - len(preview_cols)
         col_text = ", ".join(preview_cols)
@@ -137,22 +281,18 @@ class CopilotService:
             f"Dataset {dataset_type} currently loaded from {path.name} has {n_rows} rows and {n_cols} columns. "
             f"Example columns: {col_text}."
         )
-        if "sku" in df.columns:
-            parts.append(f"Distinct SKUs: {df['sku'].nunique()}.")
-        if "location" in df.columns:
-            parts.append(f"Distinct locations: {df['location'].nunique()}.")
-        if "date" in df.columns:
-            try:
-                dt = pd.to_datetime(df["date"])
-                parts.append(
-                    f"Date coverage: {dt.min().date()} to {dt.max().date()}."
-                )
-            except Exception:
-                pass
+        if summary["nunique_sku"] is not None:
+            parts.append(f"Distinct SKUs: {summary['nunique_sku']}.")
+        if summary["nunique_loc"] is not None:
+            parts.append(f"Distinct locations: {summary['nunique_loc']}.")
+        if summary["date_min"] is not None:
+            parts.append(
+                f"Date coverage: {summary['date_min']} to {summary['date_max']}."
+            )
 
         return " ".join(parts)
 
-    def answer_query(self, request: CopilotQueryRequest) -> CopilotQueryResponse:
+    async def answer_query(self, request: CopilotQueryRequest) -> CopilotQueryResponse:
         # For now we implement a deterministic summariser that inspects the in-memory
         # context instead of calling an external LLaMA server.
         # The request structure is designed so a future LLaMA integration can turn
@@ -163,25 +303,10 @@ class CopilotService:
         query_text = (request.query or "").strip()
         lower_q = query_text.lower()
 
-        is_greeting = (
-            lower_q in {"hi", "hello", "hey"}
-            or lower_q.startswith("hi ")
-            or lower_q.startswith("hello ")
-            or lower_q.startswith("hey ")
-        )
-        is_capability_question = (
-            "what can you do" in lower_q
-            or "what u can do" in lower_q
-            or ("help" in lower_q and "can you" in lower_q)
-        )
+        is_greeting = lower_q in _GREETING_EXACT or _GREETING_RE.match(lower_q) is not None
+        is_capability_question = _CAPABILITY_RE.search(lower_q) is not None
 
         if is_greeting or is_capability_question:
-            capability_lines: List[str] = [
-                "- Summarise the latest forecast and highlight top risk SKUs.",
-                "- Explain your current supply plan KPIs and key trade-offs.",
-                "- Describe scenarios (upside / downside) versus the base plan.",
-                "- Inspect the uploaded Sales dataset and point out its structure.",
-            ]
             session_bits: List[str] = []
             if store.forecasts:
                 session_bits.append(f"{len(store.forecasts)} forecast(s)")
@@ -192,36 +317,14 @@ class CopilotService:
             if request.dataset_type:
                 session_bits.append(f"dataset '{request.dataset_type}'")
 
-            context_line = ""
+            answer = _CAPABILITY_ANSWER
             if session_bits:
-                context_line = "Right now I can see " + ", ".join(session_bits) + " in this session."
-
-            greeting = "Hi! I'm your IBP AI copilot."
-            if query_text and not is_capability_question and not is_greeting:
-                greeting = f"You asked: '{query_text}'. I am your IBP AI copilot."
-
-            answer = greeting + "\n" + "\n".join(capability_lines)
-            if context_line:
-                answer += "\n\n" + context_line
-
-            greeting_actions: List[str] = [
-                "Ask me to summarise the latest forecast and highlight risk SKUs.",
-                "Ask me to explain your current plan KPIs.",
-                "Ask me to compare a scenario against the base plan.",
-                "Ask me to review the Sales dataset for basic data quality issues.",
-            ]
-
-            used_context = {
-                "has_forecast": bool(store.forecasts),
-                "has_plan": bool(store.plans),
-                "scenario_count": len(store.scenarios),
-                "dataset_type": request.dataset_type,
-            }
+                answer = f"{answer}\n\nRight now I can see {', '.join(session_bits)} in this session."
 
             return CopilotQueryResponse(
                 answer=answer,
-                suggested_actions=greeting_actions,
-                used_context=used_context,
+                suggested_actions=_GREETING_ACTIONS,
+                used_context=_used_context(request),
             )
 
         # Base actions driven by selected contexts
@@ -238,34 +341,18 @@ class CopilotService:
             actions.append("Open Scenario Lab to compare scenarios side by side.")
 
         if CopilotContext.data in request.contexts:
-            pieces.append("• Data: " + self._summarize_dataset(request.dataset_type))
+            # Reading an uncached dataset is blocking pandas I/O.
+            dataset_text = await run_in_threadpool(self._summarize_dataset, request.dataset_type)
+            pieces.append("• Data: " + dataset_text)
             actions.append("Use the Data import tab to adjust or validate source data.")
 
-        # Light query understanding to tailor guidance
-        if "risk" in lower_q or "downside" in lower_q:
-            actions.append(
-                "Focus on the highest-volume or most volatile SKUs and stress-test them with downside scenarios."
-            )
-        if "inventory" in lower_q or "stock" in lower_q:
-            actions.append(
-                "Compare forecast demand with inventory KPIs and adjust safety stock or reorder rules where needed."
-            )
-        if "scenario" in lower_q or "what if" in lower_q:
-            actions.append(
-                "Create at least one upside and one downside scenario in Scenario Lab to frame the planning range."
-            )
-        if any(word in lower_q for word in ["data", "file", "csv", "dataset"]):
-            actions.append(
-                "Inspect the uploaded dataset on the Data import tab and fix missing or unexpected columns before trusting results."
-            )
+        # Light query understanding to tailor guidance: one scan of the query
+        # for every keyword, then the matching rules in their declared order.
+        hits = {_KEYWORD_ACTION[m.group(1)] for m in _KEYWORD_RE.finditer(lower_q)}
+        actions.extend(action for _, action in _KEYWORD_RULES if action in hits)
 
         # Deduplicate actions while preserving order
-        unique_actions: List[str] = []
-        seen: set[str] = set()
-        for a in actions:
-            if a not in seen:
-                unique_actions.append(a)
-                seen.add(a)
+        unique_actions = list(dict.fromkeys(actions))
 
         intro_parts: List[str] = []
         if query_text:
@@ -278,16 +365,11 @@ class CopilotService:
             summary_text = " ".join(intro_parts)
 
         answer = summary_text
-        used_context = {
-            "has_forecast": bool(store.forecasts),
-            "has_plan": bool(store.plans),
-            "scenario_count": len(store.scenarios),
-            "dataset_type": request.dataset_type,
-        }
+        used_context = _used_context(request)
 
         if self.settings.groq_api_key:
             try:
-                answer = self._call_groq_model(
+                answer = await self._call_groq_model(
                     query_text=query_text,
                     summary=summary_text,
                     contexts=request.contexts,
@@ -301,23 +383,13 @@ class CopilotService:
             used_context=used_context,
         )
 
-    def _call_groq_model(
+    async def _call_groq_model(
         self,
         query_text: str,
         summary: str,
         contexts: List[CopilotContext],
     ) -> str:
-        system_template = Template(
-            "\n".join(
-                [
-                    "You are the SAP IBP copilot.",
-                    "Use the following planning context to answer user questions professionally.",
-                    "Context summary:\n${summary}",
-                ]
-            )
-        )
-
-        system_prompt = system_template.substitute(summary=summary or "No context available.")
+        system_prompt = _GROQ_SYSTEM_TEMPLATE.substitute(summary=summary or "No context available.")
 
         payload: Dict[str, Any] = {
             "model": "llama-3.1-8b-instant",
@@ -334,14 +406,14 @@ class CopilotService:
             "Content-Type": "application/json",
         }
 
-        response = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            json=payload,
-            headers=headers,
-            timeout=30,
-        )
+        body = orjson.dumps(payload)
+        for attempt in range(_GROQ_RETRIES + 1):
+            response = await self._client.post(_GROQ_URL, content=body, headers=headers)
+            if response.status_code not in _GROQ_RETRY_STATUSES or attempt == _GROQ_RETRIES:
+                break
+            await asyncio.sleep(0.2 * 2**attempt)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         choices = data.get("choices") or []
         if not choices:
             return summary
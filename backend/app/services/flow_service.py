@@ -0,0 +1,58 @@
+from ..models.flow import FlowRequest, FlowResponse
+from ..models.plan import PlanGenerateRequest
+from ..models.scenario import ScenarioRequest
+from .explainability_service import ExplainabilityService
+from .forecasting_service import ForecastService
+from .planning_service import PlanningService
+from .scenario_service import ScenarioService
+
+
+class FlowService:
+    """Runs forecast -> plan -> explain -> scenario in one call.
+
+    Each step goes through the same service as its granular endpoint, so the
+    results are stored and can be fetched individually afterwards.
+    """
+
+    def __init__(
+        self,
+        forecast_service: ForecastService,
+        planning_service: PlanningService,
+        explain_service: ExplainabilityService,
+        scenario_service: ScenarioService,
+    ) -> None:
+        self.forecast_service = forecast_service
+        self.planning_service = planning_service
+        self.explain_service = explain_service
+        self.scenario_service = scenario_service
+
+    def run_flow(self, payload: FlowRequest) -> FlowResponse:
+        forecast = self.forecast_service.generate_forecast(payload.forecast)
+        plan = self.planning_service.generate_plan(
+            PlanGenerateRequest(
+                forecast_id=forecast.forecast_id,
+                objective=payload.plan.objective,
+                constraints=payload.plan.constraints,
+                location=payload.plan.location,
+            )
+        )
+        explain = self.explain_service.explain_forecast(forecast.forecast_id)
+
+        scenario = None
+        if payload.scenario is not None:
+            scenario = self.scenario_service.run_scenario(
+                ScenarioRequest(
+                    forecast_id=forecast.forecast_id,
+                    plan_id=plan.plan_id,
+                    name=payload.scenario.name,
+                    shocks=payload.scenario.shocks,
+                )
+            )
+
+        return FlowResponse(
+            forecast_id=forecast.forecast_id,
+            plan_id=plan.plan_id,
+            explain=explain,
+            scenario_id=scenario.scenario_id if scenario else None,
+            scenario_kpis=scenario.kpis if scenario else [],
+        )
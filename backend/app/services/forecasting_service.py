@@ -6,8 +6,9 @@ from ..models.forecast import (
     ForecastResponse,
     ForecastPoint,
     ForecastMetadata,
+    ForecastWarmRequest,
 )
-from ..ml.forecasting import generate_ensemble_forecast
+from ..ml.forecasting import generate_ensemble_forecast, warm_model_cache
 from .store import store
 
 
@@ -21,5 +22,8 @@ class ForecastService:
             metadata=metadata,
             metrics=metrics,
         )
-        store.forecasts[forecast_id] = response
+        store.add_forecast(response)
         return response
+
+    def warm_cache(self, payload: ForecastWarmRequest) -> Dict[str, str]:
+        return warm_model_cache(payload.sku_list, payload.location)
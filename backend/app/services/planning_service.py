@@ -30,5 +30,5 @@ class PlanningService:
             production=production,
             kpis=kpis,
         )
-        store.plans[plan_id] = response
+        store.add_plan(response)
         return response
@@ -1,8 +1,13 @@
+import threading
 import uuid
+from collections import OrderedDict
+from typing import List
 
 from fastapi import HTTPException, status
 
+from ..models.plan import PlanResponse
 from ..models.scenario import (
+    ScenarioKPI,
     ScenarioRequest,
     ScenarioResponse,
     ScenarioSummary,
@@ -13,7 +18,37 @@ from .store import store
 from ..ml.scenario import compute_scenario_kpis
 
 
+_KPI_CACHE_SIZE = 128
+
+
 class ScenarioService:
+    def __init__(self) -> None:
+        # (plan_id, shocks) -> KPIs, least recently used first. Stored plans
+        # never change, so re-running an identical scenario can reuse them.
+        self._kpi_cache: OrderedDict[tuple, List[ScenarioKPI]] = OrderedDict()
+        self._kpi_lock = threading.Lock()
+
+    def _scenario_kpis(self, plan: PlanResponse, payload: ScenarioRequest) -> List[ScenarioKPI]:
+        key = (
+            plan.plan_id,
+            tuple(
+                (s.type, s.sku, s.location, s.start_date, s.end_date, s.factor, s.delta)
+                for s in payload.shocks
+            ),
+        )
+        with self._kpi_lock:
+            kpis = self._kpi_cache.get(key)
+            if kpis is not None:
+                self._kpi_cache.move_to_end(key)
+                return list(kpis)
+
+        kpis = compute_scenario_kpis(plan, payload)
+        with self._kpi_lock:
+            self._kpi_cache[key] = kpis
+            if len(self._kpi_cache) > _KPI_CACHE_SIZE:
+                self._kpi_cache.popitem(last=False)
+        return list(kpis)
+
     def run_scenario(self, payload: ScenarioRequest) -> ScenarioResponse:
         plan = None
 
@@ -25,10 +60,11 @@ class ScenarioService:
                     detail="Plan not found",
                 )
         else:
-            for candidate in store.plans.values():
-                if candidate.forecast_id == payload.forecast_id:
-                    plan = candidate
-                    break
+            # Oldest plan generated for this forecast.
+            with store.lock:
+                plan_ids = store.plans_by_forecast.get(payload.forecast_id)
+                if plan_ids:
+                    plan = store.plans[plan_ids[0]]
 
         if plan is None:
             raise HTTPException(
@@ -36,7 +72,7 @@ class ScenarioService:
                 detail="No base plan available for scenario",
             )
 
-        kpis = compute_scenario_kpis(plan, payload)
+        kpis = self._scenario_kpis(plan, payload)
 
         # Simple narrative generation based on demand shocks and total volume KPI
         demand_factors = [
@@ -87,7 +123,7 @@ class ScenarioService:
             kpis=kpis,
             narrative=narrative,
         )
-        store.scenarios[scenario_id] = response
+        store.add_scenario(response)
         return response
 
     def list_scenarios(
@@ -97,9 +133,16 @@ class ScenarioService:
     ) -> ScenarioListResponse:
         items: list[ScenarioSummary] = []
 
-        for scenario in store.scenarios.values():
-            if forecast_id is not None and scenario.forecast_id != forecast_id:
-                continue
+        with store.lock:
+            if forecast_id is not None:
+                candidates = [
+                    store.scenarios[scenario_id]
+                    for scenario_id in store.scenarios_by_forecast.get(forecast_id, ())
+                ]
+            else:
+                candidates = list(store.scenarios.values())
+
+        for scenario in candidates:
             if plan_id is not None and scenario.plan_id != plan_id:
                 continue
 
@@ -1,15 +1,199 @@
-from typing import Dict
+import logging
+import os
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List
 
+import numpy as np
+import pandas as pd
+from pydantic import ValidationError
+
+from ..core.config import get_settings
 from ..models.forecast import ForecastResponse
 from ..models.plan import PlanResponse
 from ..models.scenario import ScenarioResponse
 
 
+logger = logging.getLogger(__name__)
+
+_JOURNAL_MODELS = {
+    "forecast": ForecastResponse,
+    "plan": PlanResponse,
+    "scenario": ScenarioResponse,
+}
+
+
+def _forecast_columns(forecast: ForecastResponse) -> Dict[str, np.ndarray]:
+    # Only the fields the summary aggregates read, one pass each over the
+    # point models.
+    points = forecast.points
+    n = len(points)
+    return {
+        "sku": np.fromiter((p.sku for p in points), dtype=object, count=n),
+        "mean": np.fromiter((p.mean for p in points), dtype="float64", count=n),
+    }
+
+
+def _summarize_forecast_columns(
+    forecast: ForecastResponse, columns: Dict[str, np.ndarray]
+) -> Dict[str, Any]:
+    totals = pd.Series(columns["mean"]).groupby(columns["sku"], sort=False).sum()
+
+    per_sku_model = forecast.metadata.per_sku_model or {}
+    model_counts = Counter(per_sku_model.values())
+
+    return {
+        "totals": totals.to_dict(),
+        # nlargest keeps first-seen order among ties, like a stable sort would.
+        "top_skus": list(totals.nlargest(5).items()),
+        # Most-used model first; ties stay in first-seen order.
+        "model_counts": model_counts.most_common(),
+    }
+
+
+class _ForecastTable(dict[str, ForecastResponse]):
+    """Forecast map that derives summary aggregates once, on insert.
+
+    Forecasts are immutable once stored, so readers such as the copilot can
+    use ``summaries[forecast_id]`` instead of walking every point per query.
+    """
+
+    def __init__(self, summaries: Dict[str, Dict[str, Any]]) -> None:
+        super().__init__()
+        self._summaries = summaries
+
+    def __setitem__(self, forecast_id: str, forecast: ForecastResponse) -> None:
+        columns = _forecast_columns(forecast)
+        self._summaries[forecast_id] = _summarize_forecast_columns(forecast, columns)
+        super().__setitem__(forecast_id, forecast)
+
+    def __delitem__(self, forecast_id: str) -> None:
+        super().__delitem__(forecast_id)
+        self._summaries.pop(forecast_id, None)
+
+
 class InMemoryStore:
-    def __init__(self) -> None:
-        self.forecasts: Dict[str, ForecastResponse] = {}
+    def __init__(self, journal_path: str | None = None) -> None:
+        # Guards every multi-dict update below and lets readers that iterate
+        # the tables (or pick the latest entry) do so without racing an
+        # insert from another worker thread.
+        self.lock = threading.RLock()
+        # Summary aggregates per forecast, maintained by the forecasts table.
+        self.forecast_summaries: Dict[str, Dict[str, Any]] = {}
+        self.forecasts: Dict[str, ForecastResponse] = _ForecastTable(self.forecast_summaries)
         self.plans: Dict[str, PlanResponse] = {}
         self.scenarios: Dict[str, ScenarioResponse] = {}
+        # forecast_id -> ids in insertion order, so lookups by forecast touch
+        # only the matching items. Kept in sync by add_plan / add_scenario.
+        self.plans_by_forecast: Dict[str, List[str]] = {}
+        self.scenarios_by_forecast: Dict[str, List[str]] = {}
+
+        # Optional append-only journal (one "<kind>\t<json>" line per insert).
+        # Replaying it in order rebuilds the tables, summaries and indexes
+        # exactly as they were, so a restart keeps session context. Nothing
+        # is ever updated or removed, so the file holds the same entries as
+        # memory does; delete it to start a fresh session.
+        self._journal = None
+        # Serialises journal appends. Taken before ``lock`` and held past it,
+        # so lines follow insertion order while readers of the tables are not
+        # blocked on file I/O.
+        self._journal_lock = threading.Lock()
+        if journal_path:
+            path = Path(journal_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._replay(path)
+            self._journal = path.open("a", encoding="utf-8")
+
+    def _replay(self, path: Path) -> None:
+        if not path.exists():
+            return
+        adders = {
+            "forecast": self.add_forecast,
+            "plan": self.add_plan,
+            "scenario": self.add_scenario,
+        }
+        kept: List[str] = []
+        skipped = 0
+        with path.open(encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, start=1):
+                kind, _, payload = line.partition("\t")
+                model = _JOURNAL_MODELS.get(kind)
+                if model is None:
+                    logger.warning("Skipping unknown entry at %s:%d", path, line_no)
+                    skipped += 1
+                    continue
+                try:
+                    item = model.model_validate_json(payload)
+                except ValidationError:
+                    # Typically a line cut short by a crash mid-write.
+                    logger.warning("Skipping unreadable %s at %s:%d", kind, path, line_no)
+                    skipped += 1
+                    continue
+                adders[kind](item)
+                kept.append(line if line.endswith("\n") else line + "\n")
+        if skipped:
+            # Rewrite without the bad lines, so a cut-off last line does not
+            # swallow the next append and the warnings are not repeated.
+            self._rewrite_journal(path, kept)
+
+    @staticmethod
+    def _rewrite_journal(path: Path, lines: List[str]) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.writelines(lines)
+            os.replace(tmp_name, path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _insert(
+        self,
+        kind: str,
+        item: ForecastResponse | PlanResponse | ScenarioResponse,
+        apply: Callable[[], None],
+    ) -> None:
+        if self._journal is None:
+            with self.lock:
+                apply()
+            return
+        # Serialise before taking any lock; only the table update holds ``lock``.
+        line = f"{kind}\t{item.model_dump_json()}\n"
+        with self._journal_lock:
+            with self.lock:
+                apply()
+            if self._journal is not None:
+                self._journal.write(line)
+                self._journal.flush()
+
+    def add_forecast(self, forecast: ForecastResponse) -> None:
+        def apply() -> None:
+            self.forecasts[forecast.forecast_id] = forecast
+
+        self._insert("forecast", forecast, apply)
+
+    def add_plan(self, plan: PlanResponse) -> None:
+        def apply() -> None:
+            self.plans[plan.plan_id] = plan
+            self.plans_by_forecast.setdefault(plan.forecast_id, []).append(plan.plan_id)
+
+        self._insert("plan", plan, apply)
+
+    def add_scenario(self, scenario: ScenarioResponse) -> None:
+        def apply() -> None:
+            self.scenarios[scenario.scenario_id] = scenario
+            self.scenarios_by_forecast.setdefault(scenario.forecast_id, []).append(scenario.scenario_id)
+
+        self._insert("scenario", scenario, apply)
+
+    def close(self) -> None:
+        """Close the journal; later inserts stay in memory only."""
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
 
 
-store = InMemoryStore()
+store = InMemoryStore(get_settings().store_journal_path or None)
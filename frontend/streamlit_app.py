@@ -10,14 +10,17 @@ API_BASE_URL_DEFAULT = "http://localhost:8000"
 API_KEY_DEFAULT = "dev-api-key-change-me"
 
 
-def call_api(method: str, path: str, json: dict | None = None):
-    base_url = st.session_state.get("api_base_url", API_BASE_URL_DEFAULT)
-    api_key = st.session_state.get("api_key", API_KEY_DEFAULT)
+def _http_session() -> requests.Session:
+    # Reuse one keep-alive session per browser session instead of opening a
+    # new connection to the backend on every call.
+    session = st.session_state.get("http")
+    if session is None:
+        session = st.session_state["http"] = requests.Session()
+    return session
 
-    headers = {"X-API-Key": api_key}
 
-    url = base_url.rstrip("/") + path
-    response = requests.request(method, url, headers=headers, json=json, timeout=30)
+def _send(session: requests.Session, method: str, url: str, api_key: str, json: dict | None = None):
+    response = session.request(method, url, headers={"X-API-Key": api_key}, json=json, timeout=30)
 
     if not response.ok:
         raise RuntimeError(f"API error {response.status_code}: {response.text}")
@@ -25,6 +28,38 @@ def call_api(method: str, path: str, json: dict | None = None):
     return response.json()
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_get(url: str, api_key: str, _session: requests.Session):
+    # Every widget interaction reruns the script; GET results are keyed on
+    # the URL and API key so repeats are served without a round-trip.
+    # Failed calls raise and are therefore never cached.
+    return _send(_session, "GET", url, api_key)
+
+
+def call_api(method: str, path: str, json: dict | None = None):
+    base_url = st.session_state.get("api_base_url", API_BASE_URL_DEFAULT)
+    api_key = st.session_state.get("api_key", API_KEY_DEFAULT)
+    url = base_url.rstrip("/") + path
+
+    if method == "GET":
+        return _cached_get(url, api_key, _http_session())
+
+    data = _send(_http_session(), method, url, api_key, json=json)
+    # A write can change what later GETs return (e.g. a new forecast), so
+    # drop cached reads rather than risk serving stale ones.
+    _cached_get.clear()
+    return data
+
+
+def forecast_frame(points: List[dict]) -> pd.DataFrame:
+    # Fixed columns skip key discovery across the records; the API always
+    # returns ISO dates, and every SKU repeats the same handful of them, so
+    # an explicit format plus the conversion cache avoid re-parsing.
+    frame = pd.DataFrame.from_records(points, columns=("sku", "date", "mean", "q10", "q90"))
+    frame["date"] = pd.to_datetime(frame["date"], format="%Y-%m-%d", cache=True)
+    return frame
+
+
 def page_sidebar():
     st.sidebar.header("IBP API Settings")
     api_base = st.sidebar.text_input("API base URL", value=API_BASE_URL_DEFAULT)
@@ -64,6 +99,9 @@ def page_control_tower():
             else:
                 st.session_state["forecast"] = data
                 st.session_state["forecast_id"] = data["forecast_id"]
+                # Streamlit reruns the script on every interaction; build the
+                # chart frame once per forecast rather than once per rerun.
+                st.session_state["forecast_df"] = forecast_frame(data["points"])
                 st.success(f"Created forecast {data['forecast_id']}")
 
     with cols[1]:
@@ -100,22 +138,24 @@ def page_control_tower():
 
     if "forecast" in st.session_state:
         st.subheader("Forecast vs time")
-        points = st.session_state["forecast"]["points"]
-        df = pd.DataFrame(points)
-        df["date"] = pd.to_datetime(df["date"])
+        df = st.session_state.get("forecast_df")
+        if df is None:
+            df = st.session_state["forecast_df"] = forecast_frame(st.session_state["forecast"]["points"])
+        # pivot_table rather than pivot: a SKU listed twice in the request
+        # repeats its (date, sku) points, which pivot rejects.
         st.line_chart(
-            df.pivot_table(index="date", columns="sku", values="mean"),
+            df.pivot_table(index="date", columns="sku", values="mean", aggfunc="mean"),
         )
 
         st.subheader("Top risk SKUs (by total volume)")
         top = (
-            df.groupby("sku")["mean"]
+            df.groupby("sku", sort=False)["mean"]
             .sum()
-            .sort_values(ascending=False)
+            .nlargest(5)
             .reset_index()
             .rename(columns={"mean": "total_forecast"})
         )
-        st.table(top.head(5))
+        st.table(top)
 
     if "plan" in st.session_state:
         st.subheader("Plan KPIs")
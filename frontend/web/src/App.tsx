@@ -28,6 +28,7 @@ type ForecastResponse = {
   metadata: {
     model_name: string;
     model_version: string;
+    components?: string[];
     per_sku_model?: Record<string, string>;
   };
   metrics?: Record<string, number>;
@@ -226,7 +227,7 @@ type CopilotQueryResponse = {
   const [startDate, setStartDate] = useState('2025-01-01');
   const [endDate, setEndDate] = useState('2025-01-30');
   const [granularity, setGranularity] = useState<'D' | 'W' | 'M'>('D');
-  const [forecastModel, setForecastModel] = useState<'auto' | 'baseline' | 'arima' | 'prophet' | 'xgboost'>('auto');
+  const [forecastModel, setForecastModel] = useState<'auto' | 'baseline' | 'arima' | 'prophet' | 'ar1' | 'xgboost'>('auto');
 
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -546,8 +547,8 @@ type CopilotQueryResponse = {
 
   const skuMetrics: Record<string, { mape?: number; mae?: number }> = {};
   if (forecast?.metrics && forecast.metadata.per_sku_model) {
-   // Backend stores per-model metrics using prefixes: arima_*, prophet_*, xgb_*
-   const metricPrefixes = ['arima', 'prophet', 'xgb'];
+   // Auto selection reports validation metrics per candidate: arima_*, prophet_*, ar1_*
+   const metricPrefixes = ['arima', 'prophet', 'ar1'];
    Object.keys(forecast.metadata.per_sku_model).forEach((sku) => {
     let bestMape: number | undefined;
     let bestMae: number | undefined;
@@ -785,6 +786,7 @@ type CopilotQueryResponse = {
           <option value="baseline">Baseline</option>
           <option value="arima">ARIMA</option>
           <option value="prophet">Prophet</option>
+          <option value="ar1">AR(1)</option>
           <option value="xgboost">XGBoost</option>
          </select>
         </div>
@@ -979,7 +981,7 @@ type CopilotQueryResponse = {
       <div className="bg-slate-900/60 border border-slate-800 rounded-xl p-6 shadow-lg shadow-slate-950/30 text-slate-100">
        <div className="flex items-center justify-between mb-2">
         <h3 className="font-semibold">Model selection by SKU</h3>
-        <span className="text-xs text-slate-400">ARIMA / Prophet / XGBoost / baseline</span>
+        <span className="text-xs text-slate-400">ARIMA / Prophet / AR(1) / XGBoost / baseline</span>
        </div>
        <div className="overflow-x-auto text-sm">
         <table className="min-w-full border border-slate-800 rounded">
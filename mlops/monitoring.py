@@ -1,14 +1,16 @@
-import pandas as pd
+import numpy as np
 
 from backend.app.feature_store.registry import load_sales_with_signals
 
 
 def compute_simple_mape() -> float:
     df = load_sales_with_signals()
-    daily = df.groupby("date")["quantity"].sum().sort_index()
-    baseline = daily.mean()
-    mape = (daily.sub(baseline).abs() / daily.clip(lower=1)).mean()
-    return float(mape)
+    # Day order does not affect a mean, so the groupby skips sorting and the
+    # rest runs on the raw array with a single scratch buffer.
+    daily = df.groupby("date", sort=False)["quantity"].sum().to_numpy(dtype="float64")
+    errors = np.abs(daily - daily.mean())
+    errors /= np.maximum(daily, 1.0)
+    return float(errors.mean())
 
 
 def main() -> None:
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+
+import httpx
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+# Settings read the environment when they are first imported, so point the
+# on-disk caches at a scratch directory before the app is. Entries left by an
+# earlier run or another checkout could otherwise hide a regression.
+_CACHE_ROOT = tempfile.mkdtemp(prefix="ibp-tests-")
+os.environ["IBP_FORECAST_CACHE_DIR"] = os.path.join(_CACHE_ROOT, "forecast_models")
+os.environ["IBP_FEATURE_SNAPSHOT_DIR"] = os.path.join(_CACHE_ROOT, "feature_snapshots")
+os.environ["IBP_STORE_JOURNAL"] = ""
+
+from backend.app.main import app  # noqa: E402
+
+
+API_HEADERS = {"X-API-Key": "dev-api-key-change-me"}
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+START_DATE = "2025-01-01"
+END_DATE = "2025-01-07"
+
+# A single SKU-day is enough for the tests that only need ids to work with;
+# multi-SKU forecasting is covered by a dedicated slow test.
+FORECAST_PAYLOAD = {
+    "sku_list": ["SKU-001"],
+    "start_date": START_DATE,
+    "end_date": START_DATE,
+    "granularity": "D",
+    "location": "WH-1",
+}
+
+PLAN_PAYLOAD = {
+    "objective": "service_level",
+    "constraints": {
+        "target_service_level": 0.95,
+        "max_days_of_cover": 90,
+        "min_days_of_cover": 0,
+        "lead_time_days": 10,
+    },
+    "location": "WH-1",
+}
+
+DEMAND_UP = {
+    "type": "demand",
+    "sku": None,
+    "location": None,
+    "start_date": START_DATE,
+    "end_date": START_DATE,
+    "factor": 1.2,
+    "delta": 0.0,
+}
+
+SCENARIO_PAYLOAD = {"name": "Demand x1.2", "shocks": [DEMAND_UP]}
+
+
+def post_json(client, url: str, payload: dict):
+    """POST ``payload`` encoded with orjson; awaitable when ``client`` is async."""
+    return client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+
+
+def read_json(response: httpx.Response):
+    return orjson.loads(response.content)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run the pytest-benchmark endpoint timings (skipped by default)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: heavier end-to-end cases (deselect with -m 'not slow')")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_CACHE_ROOT, ignore_errors=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks repeat each request for many rounds, so they only run when
+    # asked for explicitly.
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --run-benchmarks")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One client for the whole run: the app's lifespan and the client's
+    # portal are set up once, and every request carries the API key.
+    with TestClient(app) as test_client:
+        test_client.headers.update(API_HEADERS)
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def async_client():
+    # Drives the app in-process on the test's event loop, so independent
+    # requests can be awaited together instead of one portal call at a time.
+    # Both clients call the ASGI app directly and never open a socket, so
+    # there is no connection pool to size: any number of concurrent requests
+    # already share the one in-process transport.
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=API_HEADERS) as ac:
+        yield ac
+
+
+@pytest.fixture(scope="session")
+def forecast_and_plan(client):
+    """Create one forecast and a plan for it, shared by every test that needs them."""
+    r_forecast = post_json(client, "/api/v1/forecast", FORECAST_PAYLOAD)
+    r_forecast.raise_for_status()
+    # The API emits compact JSON, so a non-empty list shows up as '[{'.
+    assert b'"points":[{' in r_forecast.content
+    forecast_id = read_json(r_forecast)["forecast_id"]
+
+    r_plan = post_json(client, "/api/v1/plan/generate", {**PLAN_PAYLOAD, "forecast_id": forecast_id})
+    r_plan.raise_for_status()
+    return forecast_id, read_json(r_plan)["plan_id"]
@@ -0,0 +1,87 @@
+"""Per-endpoint latency of the planning flow.
+
+Each endpoint is benchmarked on its own so a slowdown can be pinned to the
+forecast, plan, explain or scenario step. Skipped unless ``--run-benchmarks``
+is given (or when pytest-benchmark is not installed); compare runs with
+``--benchmark-autosave`` / ``--benchmark-compare``.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.services import (
+    copilot_service,
+    explainability_service,
+    forecasting_service,
+    planning_service,
+    scenario_service,
+)
+from backend.app.services.store import InMemoryStore
+
+from .conftest import API_HEADERS, FORECAST_PAYLOAD, PLAN_PAYLOAD, SCENARIO_PAYLOAD, post_json, read_json
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.slow
+
+_STORE_USERS = (
+    copilot_service,
+    explainability_service,
+    forecasting_service,
+    planning_service,
+    scenario_service,
+)
+
+
+@pytest.fixture(scope="module")
+def bench_client():
+    # Hundreds of rounds each add a forecast, plan or scenario, so the
+    # benchmarks get a store of their own instead of filling the session one
+    # the other tests read from. No journal, so nothing is written to disk.
+    with pytest.MonkeyPatch.context() as mp:
+        bench_store = InMemoryStore()
+        for module in _STORE_USERS:
+            mp.setattr(module, "store", bench_store)
+        with TestClient(app) as test_client:
+            test_client.headers.update(API_HEADERS)
+            yield test_client
+
+
+@pytest.fixture(scope="module")
+def bench_ids(bench_client):
+    r_forecast = post_json(bench_client, "/api/v1/forecast", FORECAST_PAYLOAD)
+    r_forecast.raise_for_status()
+    forecast_id = read_json(r_forecast)["forecast_id"]
+
+    r_plan = post_json(bench_client, "/api/v1/plan/generate", {**PLAN_PAYLOAD, "forecast_id": forecast_id})
+    r_plan.raise_for_status()
+    return forecast_id, read_json(r_plan)["plan_id"]
+
+
+def _bench(benchmark, call):
+    # One warm call first, so the fitted-model caches are primed and a
+    # failing endpoint raises rather than being timed.
+    call().raise_for_status()
+    benchmark(call)
+
+
+def test_forecast_endpoint(benchmark, bench_client) -> None:
+    _bench(benchmark, lambda: post_json(bench_client, "/api/v1/forecast", FORECAST_PAYLOAD))
+
+
+def test_plan_endpoint(benchmark, bench_client, bench_ids) -> None:
+    forecast_id, _ = bench_ids
+    payload = {**PLAN_PAYLOAD, "forecast_id": forecast_id}
+    _bench(benchmark, lambda: post_json(bench_client, "/api/v1/plan/generate", payload))
+
+
+def test_explain_endpoint(benchmark, bench_client, bench_ids) -> None:
+    forecast_id, _ = bench_ids
+    _bench(benchmark, lambda: bench_client.get(f"/api/v1/explain/{forecast_id}"))
+
+
+def test_scenario_endpoint(benchmark, bench_client, bench_ids) -> None:
+    forecast_id, plan_id = bench_ids
+    payload = {**SCENARIO_PAYLOAD, "forecast_id": forecast_id, "plan_id": plan_id}
+    _bench(benchmark, lambda: post_json(bench_client, "/api/v1/scenario", payload))
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from backend.app.models.copilot import CopilotQueryRequest
+from backend.app.services import copilot_service
+from backend.app.services.copilot_service import CopilotService
+
+
+@pytest.mark.anyio
+async def test_groq_call_retries_transient_status(monkeypatch) -> None:
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "LLM says hi"}}]})
+
+    async def no_sleep(_delay: float) -> None:
+        return None
+
+    # Skip only the service's backoff; the event loop's own asyncio is untouched.
+    monkeypatch.setattr(copilot_service, "asyncio", SimpleNamespace(sleep=no_sleep))
+
+    service = CopilotService(transport=httpx.MockTransport(handler))
+    service.settings = service.settings.model_copy(update={"groq_api_key": "test-key"})
+    try:
+        response = await service.answer_query(CopilotQueryRequest(query="status?", contexts=[]))
+    finally:
+        await service.aclose()
+
+    assert response.answer == "LLM says hi"
+    assert len(attempts) == 2
+    assert attempts[-1].headers["authorization"] == "Bearer test-key"
@@ -0,0 +1,95 @@
+import io
+
+import pandas as pd
+import pytest
+
+from backend.app.api.v1 import routes_data
+from backend.app.feature_store import registry
+
+from .conftest import read_json
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    # Uploads land in a scratch directory instead of data/uploads, which the
+    # feature store and the other tests read from.
+    # routes_data writes through its own import of the name, and reads back
+    # through registry.resolve_dataset.
+    monkeypatch.setattr(routes_data, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(registry, "UPLOAD_DIR", tmp_path)
+    return tmp_path
+
+
+def _upload(client, name: str, content: bytes, dataset_type: str = "master_data"):
+    return client.post(
+        "/api/v1/data/upload",
+        data={"dataset_type": dataset_type},
+        files={"file": (name, content)},
+    )
+
+
+def _preview(client, dataset_type: str = "master_data"):
+    response = client.get("/api/v1/data/preview", params={"dataset_type": dataset_type})
+    response.raise_for_status()
+    return read_json(response)
+
+
+def _xlsx(frame: pd.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    frame.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def test_csv_upload_is_previewed_with_nan_as_null(client, upload_dir) -> None:
+    csv = b"sku,description,category,uom,weight\nSKU-1,Widget,A,EA,1.5\nSKU-2,Gadget,B,EA,\n"
+    response = _upload(client, "master.csv", csv)
+    response.raise_for_status()
+    body = read_json(response)
+
+    assert body["rows"] == 2
+    assert body["columns"] == ["sku", "description", "category", "uom", "weight"]
+    assert body["warnings"] == []
+    assert body["preview"][1]["weight"] is None
+    assert (upload_dir / "master_data.csv").exists()
+    assert _preview(client)["preview"] == body["preview"]
+
+
+def test_excel_upload_is_stored_as_parquet(client, upload_dir) -> None:
+    frame = pd.DataFrame({"sku": ["SKU-1", "SKU-2", "SKU-3"], "uom": ["EA", "KG", "EA"]})
+    response = _upload(client, "master.xlsx", _xlsx(frame))
+    response.raise_for_status()
+    body = read_json(response)
+
+    assert body["rows"] == 3
+    assert body["path"].endswith("master_data.parquet")
+    assert sorted(p.name for p in upload_dir.iterdir()) == ["master_data.parquet", "master_data.xlsx"]
+    # The missing master-data columns are reported, not rejected.
+    assert body["warnings"]
+
+
+def test_reupload_invalidates_cached_preview(client, upload_dir) -> None:
+    _upload(client, "master.csv", b"sku,uom\nSKU-1,EA\n").raise_for_status()
+    assert _preview(client)["rows"] == 1
+
+    _upload(client, "master.csv", b"sku,uom\nSKU-1,EA\nSKU-2,KG\n").raise_for_status()
+    assert _preview(client)["rows"] == 2
+
+    # A later Excel upload replaces the CSV rather than sitting beside it.
+    frame = pd.DataFrame({"sku": ["SKU-1", "SKU-2", "SKU-3"], "uom": ["EA", "KG", "EA"]})
+    _upload(client, "master.xlsx", _xlsx(frame)).raise_for_status()
+    preview = _preview(client)
+    assert preview["rows"] == 3
+    assert not (upload_dir / "master_data.csv").exists()
+
+
+@pytest.mark.parametrize(
+    "name, content, detail",
+    [
+        ("master.csv", b"sku,uom\nSKU-1,EA,extra\n", "Failed to parse CSV"),
+        ("master.xlsx", b"not a workbook", "Failed to parse Excel file"),
+    ],
+)
+def test_unparseable_upload_is_rejected(client, upload_dir, name, content, detail) -> None:
+    response = _upload(client, name, content)
+    assert response.status_code == 400
+    assert read_json(response)["detail"].startswith(detail)
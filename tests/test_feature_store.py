@@ -0,0 +1,18 @@
+from backend.app.core.config import get_settings
+from backend.app.feature_store import registry
+
+
+def test_unreadable_snapshot_is_rebuilt(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(get_settings(), "feature_snapshot_dir", str(tmp_path))
+    sales = registry.resolve_dataset("sales")
+    signals = registry.resolve_dataset("external_signals")
+    snapshot = registry._snapshot_path(sales, signals)
+
+    # e.g. a snapshot cut short by a crash mid-write
+    snapshot.write_bytes(b"PAR1 not really parquet")
+
+    merged = registry.load_sales_with_signals()
+    assert not merged.empty
+    assert registry.load_sales_with_signals().equals(merged)
+    # Only the finished snapshot is left behind, no temp files.
+    assert [p.name for p in tmp_path.iterdir()] == [snapshot.name]
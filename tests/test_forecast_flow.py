@@ -1,71 +1,144 @@
-from datetime import date
+import asyncio
 
-from fastapi.testclient import TestClient
+import pytest
 
-from backend.app.main import app
+from .conftest import (
+    DEMAND_UP,
+    END_DATE,
+    FORECAST_PAYLOAD,
+    PLAN_PAYLOAD,
+    SCENARIO_PAYLOAD,
+    post_json,
+    read_json,
+)
 
 
-client = TestClient(app)
+DEMAND_DOWN = {**DEMAND_UP, "factor": 0.8}
+SUPPLY_CUT = {**DEMAND_UP, "type": "supply", "factor": 0.5}
 
-API_HEADERS = {"X-API-Key": "dev-api-key-change-me"}
+MULTI_SKU_FORECAST_PAYLOAD = {
+    **FORECAST_PAYLOAD,
+    "sku_list": ["SKU-001", "SKU-002"],
+    "end_date": END_DATE,
+}
 
+FLOW_PAYLOAD = {
+    "forecast": FORECAST_PAYLOAD,
+    "plan": PLAN_PAYLOAD,
+    "scenario": SCENARIO_PAYLOAD,
+}
 
-def test_forecast_plan_scenario_and_explain() -> None:
-    forecast_payload = {
-        "sku_list": ["SKU-001", "SKU-002"],
-        "start_date": date(2025, 1, 1).isoformat(),
-        "end_date": date(2025, 1, 7).isoformat(),
-        "granularity": "D",
-        "location": "WH-1",
-    }
+WARM_PAYLOAD = {"sku_list": ["SKU-001"], "location": "WH-1"}
 
-    r_forecast = client.post("/api/v1/forecast", json=forecast_payload, headers=API_HEADERS)
-    assert r_forecast.status_code == 200
-    forecast = r_forecast.json()
-    forecast_id = forecast["forecast_id"]
-    assert forecast["points"]
 
-    plan_payload = {
-        "forecast_id": forecast_id,
-        "objective": "service_level",
-        "constraints": {
-            "target_service_level": 0.95,
-            "max_days_of_cover": 90,
-            "min_days_of_cover": 0,
-            "lead_time_days": 10,
-        },
-        "location": "WH-1",
-    }
+@pytest.mark.anyio
+async def test_forecast_plan_scenario_and_explain(async_client, forecast_and_plan) -> None:
+    forecast_id, plan_id = forecast_and_plan
+    scenario_payload = {**SCENARIO_PAYLOAD, "forecast_id": forecast_id, "plan_id": plan_id}
 
-    r_plan = client.post("/api/v1/plan/generate", json=plan_payload, headers=API_HEADERS)
-    assert r_plan.status_code == 200
-    plan = r_plan.json()
-    plan_id = plan["plan_id"]
+    # Explanation and scenario only depend on the forecast and plan, so issue
+    # them together.
+    r_explain, r_scenario = await asyncio.gather(
+        async_client.get(f"/api/v1/explain/{forecast_id}"),
+        post_json(async_client, "/api/v1/scenario", scenario_payload),
+    )
+    for response in (r_explain, r_scenario):
+        response.raise_for_status()
 
-    r_explain = client.get(f"/api/v1/explain/{forecast_id}", headers=API_HEADERS)
-    assert r_explain.status_code == 200
-    explain = r_explain.json()
+    explain = read_json(r_explain)
     assert explain["forecast_id"] == forecast_id
     assert explain["global_importance"]
+    assert b'"kpis":[{' in r_scenario.content
 
-    scenario_payload = {
-        "forecast_id": forecast_id,
-        "plan_id": plan_id,
-        "name": "Demand x1.2",
-        "shocks": [
-            {
-                "type": "demand",
-                "sku": None,
-                "location": None,
-                "start_date": date(2025, 1, 1).isoformat(),
-                "end_date": date(2025, 1, 7).isoformat(),
-                "factor": 1.2,
-                "delta": 0.0,
-            }
-        ],
-    }
-
-    r_scenario = client.post("/api/v1/scenario", json=scenario_payload, headers=API_HEADERS)
-    assert r_scenario.status_code == 200
-    scenario = r_scenario.json()
-    assert scenario["kpis"]
+
+def test_flow_runs_every_step_in_one_request(client) -> None:
+    r_flow = post_json(client, "/api/v1/flow", FLOW_PAYLOAD)
+    r_flow.raise_for_status()
+    flow = read_json(r_flow)
+    assert flow["explain"]["forecast_id"] == flow["forecast_id"]
+    assert flow["plan_id"]
+    assert flow["scenario_id"]
+    assert flow["scenario_kpis"]
+
+
+def test_auto_forecast_reports_every_candidate(client) -> None:
+    r_forecast = post_json(client, "/api/v1/forecast", FORECAST_PAYLOAD)
+    r_forecast.raise_for_status()
+    forecast = read_json(r_forecast)
+    assert forecast["metadata"]["model_name"] == "arima_prophet_ar1_ensemble"
+    assert forecast["metadata"]["components"] == ["arima", "prophet", "ar1"]
+    for key in ("arima_mape", "prophet_mape", "ar1_mape", "ar1_mae"):
+        assert f"SKU-001.{key}" in forecast["metrics"]
+
+
+# Only demand shocks move total volume; other shock types leave it unchanged.
+@pytest.mark.parametrize(
+    ("shock", "direction"),
+    [(DEMAND_UP, 1), (DEMAND_DOWN, -1), (SUPPLY_CUT, 0)],
+    ids=["demand-up", "demand-down", "supply-cut"],
+)
+def test_scenario(client, forecast_and_plan, shock, direction) -> None:
+    forecast_id, plan_id = forecast_and_plan
+    r_scenario = post_json(
+        client,
+        "/api/v1/scenario",
+        {"forecast_id": forecast_id, "plan_id": plan_id, "shocks": [shock]},
+    )
+    r_scenario.raise_for_status()
+    total = next(k for k in read_json(r_scenario)["kpis"] if k["name"] == "Total Volume")
+    assert (total["delta"] > 0) - (total["delta"] < 0) == direction
+
+
+@pytest.mark.slow
+def test_multi_sku_forecast(client) -> None:
+    r_forecast = post_json(client, "/api/v1/forecast", MULTI_SKU_FORECAST_PAYLOAD)
+    r_forecast.raise_for_status()
+    forecast = read_json(r_forecast)
+    assert {p["sku"] for p in forecast["points"]} == {"SKU-001", "SKU-002"}
+    assert len(forecast["points"]) == 14
+
+
+def test_forecast_warm_is_accepted(client) -> None:
+    r_warm = post_json(client, "/api/v1/forecast/warm", WARM_PAYLOAD)
+    assert r_warm.status_code == 202
+    assert read_json(r_warm)["status"] == "scheduled"
+
+
+def test_store_journal_replays_after_restart(forecast_and_plan, tmp_path) -> None:
+    from backend.app.services.store import InMemoryStore, store
+
+    forecast_id, plan_id = forecast_and_plan
+
+    journal = tmp_path / "store.jsonl"
+    first = InMemoryStore(str(journal))
+    first.add_forecast(store.forecasts[forecast_id])
+    first.add_plan(store.plans[plan_id])
+
+    restarted = InMemoryStore(str(journal))
+    assert restarted.forecasts[forecast_id] == store.forecasts[forecast_id]
+    assert restarted.plans_by_forecast[forecast_id] == [plan_id]
+    assert restarted.forecast_summaries[forecast_id] == first.forecast_summaries[forecast_id]
+
+
+def test_store_journal_skips_truncated_last_line(forecast_and_plan, tmp_path) -> None:
+    from backend.app.services.store import InMemoryStore, store
+
+    forecast_id, plan_id = forecast_and_plan
+
+    journal = tmp_path / "store.jsonl"
+    first = InMemoryStore(str(journal))
+    first.add_forecast(store.forecasts[forecast_id])
+    first.add_plan(store.plans[plan_id])
+    first.close()
+
+    # Simulate a crash halfway through writing the plan line.
+    lines = journal.read_text(encoding="utf-8").splitlines(keepends=True)
+    journal.write_text(lines[0] + lines[1][: len(lines[1]) // 2], encoding="utf-8")
+
+    restarted = InMemoryStore(str(journal))
+    assert forecast_id in restarted.forecasts
+    assert restarted.plans == {}
+    # The cut-off line is gone, so the next append starts on a line of its own.
+    restarted.add_plan(store.plans[plan_id])
+    restarted.close()
+    assert InMemoryStore(str(journal)).plans_by_forecast[forecast_id] == [plan_id]
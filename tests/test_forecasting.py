@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from backend.app.ml import forecasting
+
+
+@pytest.mark.parametrize("scale", [100.0, 3e7, 1e9])
+def test_xgb_step_table_matches_predict(scale) -> None:
+    values = np.random.default_rng(0).random(60) * scale
+    thresholds, levels = forecasting._train_xgb.func(values.tobytes(), forecasting._MODEL_CODE_VERSION)
+
+    # Refit the same regressor directly and compare on the training inputs
+    # and on both sides of every split, where a wrong interval would show.
+    values32 = values.astype("float32")
+    model = forecasting._xgb_regressor()
+    model.fit(values32[:-1, None], values32[1:])
+    probes = np.concatenate(
+        [values32, thresholds, np.nextafter(thresholds, np.float32(-np.inf)), np.float32([0.0])]
+    )
+
+    walked = levels[np.searchsorted(thresholds, probes, side="right")]
+    np.testing.assert_array_equal(walked, model.predict(probes[:, None]).astype("float64"))
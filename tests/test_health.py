@@ -1,13 +1,8 @@
-from fastapi.testclient import TestClient
+from .conftest import read_json
 
-from backend.app.main import app
 
-
-client = TestClient(app)
-
-
-def test_health() -> None:
+def test_health(client) -> None:
     response = client.get("/health")
-    assert response.status_code == 200
-    body = response.json()
+    response.raise_for_status()
+    body = read_json(response)
     assert body["status"] == "ok"